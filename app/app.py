@@ -1,5 +1,6 @@
 import os
 import sys
+from collections import defaultdict
 from pathlib import Path
 
 import pandas as pd
@@ -16,31 +17,20 @@ if code_dir not in sys.path:
 from database import DatabaseManager
 
 
-class StreamlitDashboard:
-    def __init__(self):
-        self.db = DatabaseManager()
-        st.set_page_config(
-            page_title="Literature Survey Dashboard",
-            page_icon="📚",
-            layout="wide",
-            initial_sidebar_state="expanded",
-        )
-        # Add custom CSS
-        st.markdown(
-            """
-            <style>
-                .block-container {padding-top: 1rem;}
-                .element-container {margin-bottom: 1rem;}
-                .stProgress {margin-bottom: 1rem;}
-            </style>
-        """,
-            unsafe_allow_html=True,
-        )
+@st.cache_resource
+def _get_db():
+    """One DatabaseManager per server process rather than one per rerun"""
+    return DatabaseManager()
 
-    def get_topics(self):
-        """Get all topics from database"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor(dictionary=True)
+
+CACHE_TTL = 300  # Seconds query results are reused across reruns
+
+
+# Streamlit reruns the script on every widget interaction, so the queries
+# are cached free functions; the leading underscore keeps _db out of the key
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _get_topics(_db):
+    with _db.dict_cursor() as cursor:
         cursor.execute(
             """
             SELECT t.name, COUNT(tp.paper_id) as paper_count
@@ -51,14 +41,12 @@ class StreamlitDashboard:
         """
         )
         topics = [(row["name"], row["paper_count"]) for row in cursor.fetchall()]
-        cursor.close()
-        conn.close()
-        return topics
+    return topics
 
-    def get_papers_by_topic(self, topic):
-        """Get papers for a specific topic with enhanced details"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor(dictionary=True)
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _get_papers_by_topic(_db, topic):
+    with _db.dict_cursor() as cursor:
         cursor.execute(
             """
             SELECT 
@@ -80,14 +68,12 @@ class StreamlitDashboard:
             (topic,),
         )
         papers = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return papers
+    return papers
 
-    def get_author_stats(self, topic):
-        """Get author statistics for a topic"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor(dictionary=True)
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _get_author_stats(_db, topic):
+    with _db.dict_cursor() as cursor:
         cursor.execute(
             """
             SELECT 
@@ -106,19 +92,21 @@ class StreamlitDashboard:
             (topic,),
         )
         authors = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return authors
+    return authors
 
-    # Add this method back to the StreamlitDashboard class
 
-    def get_recommendations_for_paper(self, paper_id):
-        """Get recommendations for a specific paper with enhanced details"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor(dictionary=True)
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _get_recommendations_for_papers(_db, paper_ids):
+    # paper_ids is a tuple: cache keys must be hashable
+    rec_map = defaultdict(list)
+    if not paper_ids:
+        return rec_map
+    placeholders = ", ".join(["%s"] * len(paper_ids))
+    with _db.dict_cursor() as cursor:
         cursor.execute(
-            """
+            f"""
             SELECT 
+                pr.source_paper_id,
                 p.*,
                 GROUP_CONCAT(DISTINCT a.name) as authors,
                 GROUP_CONCAT(DISTINCT a.h_index) as author_h_indices,
@@ -127,16 +115,54 @@ class StreamlitDashboard:
             JOIN paper_recommendations pr ON pr.recommended_paper_id = p.id
             LEFT JOIN paper_authors pa ON p.id = pa.paper_id
             LEFT JOIN authors a ON pa.author_id = a.id
-            WHERE pr.source_paper_id = %s
-            GROUP BY p.id
-            ORDER BY pr.recommendation_order ASC
+            WHERE pr.source_paper_id IN ({placeholders})
+            GROUP BY pr.source_paper_id, p.id
+            ORDER BY pr.source_paper_id, pr.recommendation_order ASC
         """,
-            (paper_id,),
+            paper_ids,
         )
-        recommendations = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return recommendations
+        for row in cursor.fetchall():
+            rec_map[row.pop("source_paper_id")].append(row)
+    return rec_map
+
+
+class StreamlitDashboard:
+    def __init__(self):
+        self.db = _get_db()
+        st.set_page_config(
+            page_title="Literature Survey Dashboard",
+            page_icon="📚",
+            layout="wide",
+            initial_sidebar_state="expanded",
+        )
+        # Add custom CSS
+        st.markdown(
+            """
+            <style>
+                .block-container {padding-top: 1rem;}
+                .element-container {margin-bottom: 1rem;}
+                .stProgress {margin-bottom: 1rem;}
+            </style>
+        """,
+            unsafe_allow_html=True,
+        )
+
+    def get_topics(self):
+        """Get all topics from database"""
+        return _get_topics(self.db)
+
+    def get_papers_by_topic(self, topic):
+        """Get papers for a specific topic with enhanced details"""
+        return _get_papers_by_topic(self.db, topic)
+
+    def get_author_stats(self, topic):
+        """Get author statistics for a topic"""
+        return _get_author_stats(self.db, topic)
+
+    def get_recommendations_for_papers(self, paper_ids):
+        """Get recommendations for several papers in one query, keyed by the
+        source paper id"""
+        return _get_recommendations_for_papers(self.db, tuple(paper_ids))
 
     def display_paper_details(self, paper, recommendations):
         """Display detailed paper information with enhanced formatting"""
@@ -254,6 +280,9 @@ class StreamlitDashboard:
     def run(self):
         # Sidebar
         st.sidebar.title("📚 Navigation")
+        if st.sidebar.button("Refresh"):
+            # Drop cached query results so new data shows up immediately
+            st.cache_data.clear()
         topics = self.get_topics()
         selected_topic = st.sidebar.selectbox(
             "Select Topic",
@@ -301,12 +330,12 @@ class StreamlitDashboard:
 
             # Papers Section
             st.markdown("### 📄 Papers")
+            rec_map = self.get_recommendations_for_papers(filtered_df["id"].tolist())
             for _, paper in filtered_df.iterrows():
                 with st.expander(
                     f"{paper['title']} ({paper['citation_count']} citations)"
                 ):
-                    recommendations = self.get_recommendations_for_paper(paper["id"])
-                    self.display_paper_details(paper, recommendations)
+                    self.display_paper_details(paper, rec_map[paper["id"]])
 
             # Analytics Section
             self.display_analytics(df_papers, authors_data)
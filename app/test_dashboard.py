@@ -1,5 +1,6 @@
 import os
 import sys
+from collections import defaultdict
 from pathlib import Path
 
 import numpy as np
@@ -17,49 +18,20 @@ if code_dir not in sys.path:
 from database import DatabaseManager
 
 
-class StreamlitDashboard:
-    def __init__(self):
-        self.db = DatabaseManager()
-        st.set_page_config(
-            page_title="Literature Survey Dashboard",
-            page_icon="📚",
-            layout="wide",
-            initial_sidebar_state="expanded",
-        )
-        # Add custom CSS
-        st.markdown(
-            """
-            <style>
-                .block-container {padding-top: 1rem;}
-                .element-container {margin-bottom: 1rem;}
-                .stProgress {margin-bottom: 1rem;}
-                .paper-card {
-                    padding: 1rem;
-                    border-radius: 0.5rem;
-                    border: 1px solid #e0e0e0;
-                    margin-bottom: 1rem;
-                }
-                .metric-card {
-                    background-color: #f8f9fa;
-                    padding: 1rem;
-                    border-radius: 0.5rem;
-                    margin-bottom: 1rem;
-                }
-                .recommendation-card {
-                    background-color: #f0f7ff;
-                    padding: 1rem;
-                    border-radius: 0.5rem;
-                    margin: 0.5rem 0;
-                }
-            </style>
-        """,
-            unsafe_allow_html=True,
-        )
+@st.cache_resource
+def _get_db():
+    """One DatabaseManager per server process rather than one per rerun"""
+    return DatabaseManager()
 
-    def get_topics(self):
-        """Get all topics from database with enhanced metrics"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor(dictionary=True)
+
+CACHE_TTL = 300  # Seconds query results are reused across reruns
+
+
+# Streamlit reruns the script on every widget interaction, so the queries
+# are cached free functions; the leading underscore keeps _db out of the key
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _get_topics(_db):
+    with _db.dict_cursor() as cursor:
         cursor.execute(
             """
             SELECT 
@@ -76,14 +48,12 @@ class StreamlitDashboard:
         """
         )
         topics = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return topics
+    return topics
 
-    def get_papers_by_topic(self, topic):
-        """Get papers with enhanced details"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor(dictionary=True)
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _get_papers_by_topic(_db, topic):
+    with _db.dict_cursor() as cursor:
         cursor.execute(
             """
             SELECT 
@@ -106,17 +76,48 @@ class StreamlitDashboard:
             (topic,),
         )
         papers = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return papers
-
-    def get_recommendations_for_paper(self, paper_id):
-        """Get enhanced recommendations for a paper"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor(dictionary=True)
+    return papers
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _get_author_stats(_db, topic):
+    with _db.dict_cursor() as cursor:
         cursor.execute(
             """
+                SELECT 
+                    a.name,
+                    a.h_index,
+                    a.citation_count,
+                    COUNT(DISTINCT pa.paper_id) as paper_count,
+                    GROUP_CONCAT(DISTINCT p.title) as paper_titles,
+                    SUM(p.citation_count) as total_paper_citations
+                FROM authors a
+                JOIN paper_authors pa ON a.id = pa.author_id
+                JOIN papers p ON pa.paper_id = p.id
+                JOIN topic_papers tp ON p.id = tp.paper_id
+                JOIN topics t ON tp.topic_id = t.id
+                WHERE t.name = %s
+                GROUP BY a.id
+                ORDER BY a.citation_count DESC
+            """,
+            (topic,),
+        )
+        authors = cursor.fetchall()
+    return authors
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _get_recommendations_for_papers(_db, paper_ids):
+    # paper_ids is a tuple: cache keys must be hashable
+    rec_map = defaultdict(list)
+    if not paper_ids:
+        return rec_map
+    placeholders = ", ".join(["%s"] * len(paper_ids))
+    with _db.dict_cursor() as cursor:
+        cursor.execute(
+            f"""
             SELECT 
+                pr.source_paper_id,
                 p.*,
                 GROUP_CONCAT(DISTINCT a.name) as authors,
                 GROUP_CONCAT(DISTINCT a.h_index) as author_h_indices,
@@ -127,16 +128,68 @@ class StreamlitDashboard:
             LEFT JOIN paper_authors pa ON p.id = pa.paper_id
             LEFT JOIN authors a ON pa.author_id = a.id
             LEFT JOIN paper_recommendations pr2 ON p.id = pr2.source_paper_id
-            WHERE pr.source_paper_id = %s
-            GROUP BY p.id
-            ORDER BY pr.recommendation_order ASC
+            WHERE pr.source_paper_id IN ({placeholders})
+            GROUP BY pr.source_paper_id, p.id
+            ORDER BY pr.source_paper_id, pr.recommendation_order ASC
         """,
-            (paper_id,),
+            paper_ids,
         )
-        recommendations = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return recommendations
+        for row in cursor.fetchall():
+            rec_map[row.pop("source_paper_id")].append(row)
+    return rec_map
+
+
+class StreamlitDashboard:
+    def __init__(self):
+        self.db = _get_db()
+        st.set_page_config(
+            page_title="Literature Survey Dashboard",
+            page_icon="📚",
+            layout="wide",
+            initial_sidebar_state="expanded",
+        )
+        # Add custom CSS
+        st.markdown(
+            """
+            <style>
+                .block-container {padding-top: 1rem;}
+                .element-container {margin-bottom: 1rem;}
+                .stProgress {margin-bottom: 1rem;}
+                .paper-card {
+                    padding: 1rem;
+                    border-radius: 0.5rem;
+                    border: 1px solid #e0e0e0;
+                    margin-bottom: 1rem;
+                }
+                .metric-card {
+                    background-color: #f8f9fa;
+                    padding: 1rem;
+                    border-radius: 0.5rem;
+                    margin-bottom: 1rem;
+                }
+                .recommendation-card {
+                    background-color: #f0f7ff;
+                    padding: 1rem;
+                    border-radius: 0.5rem;
+                    margin: 0.5rem 0;
+                }
+            </style>
+        """,
+            unsafe_allow_html=True,
+        )
+
+    def get_topics(self):
+        """Get all topics from database with enhanced metrics"""
+        return _get_topics(self.db)
+
+    def get_papers_by_topic(self, topic):
+        """Get papers with enhanced details"""
+        return _get_papers_by_topic(self.db, topic)
+
+    def get_recommendations_for_papers(self, paper_ids):
+        """Get recommendations for several papers in one query, keyed by the
+        source paper id"""
+        return _get_recommendations_for_papers(self.db, tuple(paper_ids))
 
     def display_paper_details(self, paper, recommendations):
         """Display enhanced paper information"""
@@ -302,36 +355,14 @@ class StreamlitDashboard:
 
     def get_author_stats(self, topic):
         """Get enhanced author statistics for a topic"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(
-            """
-                SELECT 
-                    a.name,
-                    a.h_index,
-                    a.citation_count,
-                    COUNT(DISTINCT pa.paper_id) as paper_count,
-                    GROUP_CONCAT(DISTINCT p.title) as paper_titles,
-                    SUM(p.citation_count) as total_paper_citations
-                FROM authors a
-                JOIN paper_authors pa ON a.id = pa.author_id
-                JOIN papers p ON pa.paper_id = p.id
-                JOIN topic_papers tp ON p.id = tp.paper_id
-                JOIN topics t ON tp.topic_id = t.id
-                WHERE t.name = %s
-                GROUP BY a.id
-                ORDER BY a.citation_count DESC
-            """,
-            (topic,),
-        )
-        authors = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return authors
+        return _get_author_stats(self.db, topic)
 
     def run(self):
         # Sidebar
         st.sidebar.title("📚 Navigation")
+        if st.sidebar.button("Refresh"):
+            # Drop cached query results so new data shows up immediately
+            st.cache_data.clear()
         topics = self.get_topics()
 
         # Enhanced topic selector
@@ -409,9 +440,11 @@ class StreamlitDashboard:
             paper_tabs = st.tabs(["📄 Papers", "📊 Analytics"])
 
             with paper_tabs[0]:
+                rec_map = self.get_recommendations_for_papers(
+                    filtered_df["id"].tolist()
+                )
                 for _, paper in filtered_df.iterrows():
-                    recommendations = self.get_recommendations_for_paper(paper["id"])
-                    self.display_paper_details(paper, recommendations)
+                    self.display_paper_details(paper, rec_map[paper["id"]])
 
             with paper_tabs[1]:
                 self.display_analytics(df_papers, authors_data)
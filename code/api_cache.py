@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+"""
+On-disk cache of Semantic Scholar API responses
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import orjson
+
+CACHE_DIR = os.path.expanduser(os.environ.get("S2_CACHE_DIR", "~/.cache/litsurvey"))
+CACHE_TTL = int(os.environ.get("S2_CACHE_TTL", 7 * 86400))  # seconds
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class ApiCache:
+    """
+    Raw response bodies keyed by a hash of the request, in a SQLite file.
+
+    Lookups and stores never raise: on a SQLite error the cache logs it and
+    behaves as a miss, so the API is used directly.
+    """
+
+    def __init__(self, path: str, ttl: int = CACHE_TTL, enabled: bool = True):
+        self.path = path
+        self.ttl = ttl
+        self.enabled = enabled
+        self._local = threading.local()
+        if not enabled:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                ts INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+            """
+        )
+        self.purge_expired()
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections are not shareable"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def key(method: str, endpoint: str, params=None, json=None) -> str:
+        """Hash of everything that determines the response.
+
+        Ids keep their order: batch endpoints answer in request order.
+        """
+        request = orjson.dumps(
+            [method, endpoint, params, json], option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.blake2b(request, digest_size=20).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        try:
+            row = self._connection().execute(
+                "SELECT payload FROM responses WHERE key = ? AND ts > ?",
+                (key, int(time.time()) - self.ttl),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("API cache lookup failed: %s", e)
+            return None
+        return row[0] if row else None
+
+    def set(self, key: str, payload: bytes) -> None:
+        if not self.enabled:
+            return
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO responses (key, ts, payload) VALUES (?, ?, ?)",
+                (key, int(time.time()), payload),
+            )
+        except sqlite3.Error as e:
+            logger.warning("API cache store failed: %s", e)
+
+    def purge_expired(self) -> None:
+        try:
+            self._connection().execute(
+                "DELETE FROM responses WHERE ts <= ?", (int(time.time()) - self.ttl,)
+            )
+        except sqlite3.Error as e:
+            logger.warning("API cache purge failed: %s", e)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_api_cache() -> ApiCache:
+    """Return the process-wide cache, opening it on first use.
+
+    Set S2_NO_CACHE to a true value (1, true, yes, on) to disable it; a cache
+    that cannot be opened is disabled too.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                path = os.path.join(CACHE_DIR, "responses.sqlite3")
+                enabled = not _env_flag("S2_NO_CACHE")
+                try:
+                    _cache = ApiCache(path, enabled=enabled)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning("API cache at %s unavailable: %s", path, e)
+                    _cache = ApiCache(path, enabled=False)
+    return _cache
@@ -1,172 +1,145 @@
+import logging
 import os
+import threading
 import time
-from typing import Dict, List
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field, replace
+from queue import Empty, Queue
+from typing import Callable, Dict, List, Optional
 
 import requests
 from article import Article
 from author import Author
 from database import DatabaseManager
+from mysql.connector import Error
 from utils import (add_paper_details, add_recommendations_to_positive_articles,
-                   create_session, get_author_details, get_paper_details,
+                   get_author_details, get_paper_details, get_session,
                    update_h_index)
 
+REC_BATCH_SIZE = 16  # Recommended papers written per DB batch
+SENTINEL = object()  # Marks the end of the submission queue
+AUTHOR_CACHE_SIZE = 10_000  # Author details kept in memory
+SUBMISSION_QUEUE_SIZE = 10_000  # DB writes waiting for the writer thread
+# DB writes committed per writer transaction; the writer waits up to
+# WRITER_LINGER seconds for more work before committing a smaller one
+WRITER_COMMIT_SIZE = int(os.getenv("WRITER_COMMIT_SIZE", "500"))
+WRITER_LINGER = 0.5
 
-class DataFetcher:
-    def __init__(self, db_manager: DatabaseManager):
-        self.db = db_manager
-        self.session = create_session()
-
-    # For just Main Papers(csv)
-    def process_paper(
-        self,
-        paper_data: Dict,
-        topic_id: int,
-        use_for_rec: bool,
-        paper_type: str = "positive",
-    ):
-        """Process a single paper with all related data"""
-        try:
-            paper_id = paper_data["paperId"]
-            print(f"Processing paper {paper_id}")
-
-            # Step 1: Create article object and add basic details
-            article = Article(paper_id, use_for_recommendation=use_for_rec)
-            add_paper_details(article, paper_data)
+logger = logging.getLogger(__name__)
 
-            # Step 2: Store the paper first
-            print("Storing paper basic details...")
-            try:
-                self.db.insert_paper(article)
-            except Exception as e:
-                print(f"Error storing paper: {e}")
-                return None
-
-            # Step 3: Process authors in smaller batches
-            print("Processing authors...")
-            authors = []
-            author_batch_size = 4
 
-            author_data_list = paper_data.get("authors", [])
-            for i in range(0, len(author_data_list), author_batch_size):
-                batch = author_data_list[i : i + author_batch_size]
-                print(f"Processing author batch {i//author_batch_size + 1}")
+def _snapshot_article(article: Article) -> Article:
+    """Copy of the fields the database stores, taken for the writer thread"""
+    snapshot = Article(article.article_id, article.use_for_recommendation)
+    snapshot.info = replace(article.info)
+    return snapshot
 
-                for idx, author_data in enumerate(batch, i + 1):
-                    try:
-                        author_id = author_data.get("authorId") or author_data.get(
-                            "name"
-                        )
-                        if not author_id:
-                            continue
 
-                        author = Author(
-                            author_id=author_id, author_name=author_data.get("name")
-                        )
-                        authors.append(author)
+@dataclass
+class DbOp:
+    """
+    A database write queued for the writer thread
+    """
 
-                        print(f"Storing author {idx}: {author.author_name}")
-                        self.db.insert_author(author)
-                        self.db.link_paper_author(paper_id, author_id, idx)
+    method: Callable
+    args: tuple = ()
+    future: Future = field(default_factory=Future)
 
-                    except Exception as e:
-                        print(f"Error processing author {idx}: {e}")
-                        continue
+    def execute(self):
+        return self.method(*self.args)
 
-                time.sleep(1)  # Small delay between batches
 
-            article.authors = authors
-
-            # Step 4: Update h-index in batches
-            if article.authors:
-                print("Fetching author details...")
-                author_ids = [a.author_id for a in article.authors]
-
-                for i in range(0, len(author_ids), author_batch_size):
-                    batch_ids = author_ids[i : i + author_batch_size]
-                    print(f"Fetching details for authors {i+1} to {i+len(batch_ids)}")
-                    author_details = get_author_details(batch_ids)
-                    time.sleep(1)  # Rate limiting
-
-                    # Update each author in the batch
-                    for author_detail in author_details:
-                        if author_detail:
-                            self.update_single_author(author_detail)
-
-                # Final h-index update for the paper
-                update_h_index(article, author_details)
-                self.db.insert_paper(article)
-
-            # Step 5: Link to topic
-            print("Linking paper to topic...")
-            self.db.link_topic_paper(topic_id, paper_id, paper_type, use_for_rec)
-
-            # Step 6: Process and store recommendations
-            if use_for_rec and paper_type == "positive":
-                print("Fetching paper recommendations...")
-                recommended_papers = add_recommendations_to_positive_articles(paper_id)
-
-                if recommended_papers:
-                    print(f"Found {len(recommended_papers)} recommendations")
-                    for idx, rec_paper in enumerate(recommended_papers, 1):
-                        try:
-                            # Skip if paper ID is missing
-                            if not rec_paper.get("paperId"):
-                                continue
-
-                            # Create article object for recommendation
-                            rec_article = Article(rec_paper["paperId"])
-                            add_paper_details(rec_article, rec_paper)
-
-                            # First store the recommended paper
-                            try:
-                                print(f"Storing recommended paper {idx}...")
-                                # Store paper without h-index calculation
-                                self.db.insert_paper(rec_article)
-
-                                # Process and store authors (without h-index)
-                                for author_idx, author_data in enumerate(
-                                    rec_paper.get("authors", []), 1
-                                ):
-                                    author_id = author_data.get(
-                                        "authorId"
-                                    ) or author_data.get("name")
-                                    if not author_id:
-                                        continue
-
-                                    author = Author(
-                                        author_id=author_id,
-                                        author_name=author_data.get("name"),
-                                    )
-                                    self.db.insert_author(author)
-                                    self.db.link_paper_author(
-                                        rec_article.article_id, author_id, author_idx
-                                    )
-
-                                # Store the recommendation relationship
-                                print(
-                                    f"Storing recommendation {idx}: {rec_article.info.title}"
-                                )
-                                self.db.insert_paper_recommendations(
-                                    paper_id, rec_article.article_id, idx
-                                )
-
-                            except Exception as e:
-                                print(
-                                    f"Warning: Could not store recommended paper: {e}"
-                                )
-                                continue
-
-                        except Exception as e:
-                            print(f"Error processing recommendation {idx}: {e}")
-                            continue
-                else:
-                    print("No recommendations found")
-
-            return article
+class DataFetcher:
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        self.session = get_session()
+        self._author_cache: OrderedDict = OrderedDict()
+        self._author_cache_lock = threading.Lock()
+
+        # DB writes are queued and committed by a single writer thread so the
+        # fetcher never waits on MySQL while talking to the API.
+        self.sq: Queue = Queue(maxsize=SUBMISSION_QUEUE_SIZE)
+        self._writer = threading.Thread(target=self._run_writer, daemon=True)
+        self._writer.start()
+
+    def submit(self, method: Callable, *args) -> Future:
+        """Queue a DatabaseManager write and return a future for its result"""
+        op = DbOp(method, args)
+        self.sq.put(op)
+        return op.future
+
+    def close(self):
+        """Flush pending DB writes and stop the writer thread"""
+        self.sq.put(SENTINEL)
+        self._writer.join()
+
+    def _run_writer(self):
+        """Drain the submission queue, committing consecutive ops together"""
+        while True:
+            ops = [self.sq.get()]
+            deadline = time.monotonic() + WRITER_LINGER
+            while len(ops) < WRITER_COMMIT_SIZE and ops[-1] is not SENTINEL:
+                try:
+                    ops.append(
+                        self.sq.get(timeout=max(0, deadline - time.monotonic()))
+                    )
+                except Empty:
+                    break
+
+            stop = SENTINEL in ops
+            self._execute_ops([op for op in ops if op is not SENTINEL])
+            for _ in ops:
+                self.sq.task_done()
+            if stop:
+                return
+
+    def _execute_ops(self, ops: List[DbOp]):
+        """Run ops in one transaction, falling back to one-by-one on failure"""
+        if not ops:
+            return
+        try:
+            with self.db.transaction():
+                results = [op.execute() for op in ops]
+            for op, result in zip(ops, results):
+                op.future.set_result(result)
+            return
+        except Exception as e:  # Keep the writer alive whatever an op raises
+            logger.warning(
+                "Batched write of %d ops failed (%s), retrying one by one", len(ops), e
+            )
 
-        except Exception as e:
-            print(f"Error details: {str(e)}")
-            return None
+        for op in ops:
+            try:
+                op.future.set_result(op.execute())
+            except Exception as e:
+                logger.error("Error executing %s: %s", op.method.__name__, e)
+                op.future.set_exception(e)
+
+    def get_author_details(self, author_ids: List[str]) -> List[Dict]:
+        """Get author details, only calling the API for authors not cached"""
+        with self._author_cache_lock:
+            missing = [
+                i for i in dict.fromkeys(author_ids) if i not in self._author_cache
+            ]
+
+        fetched = get_author_details(missing) if missing else []
+
+        with self._author_cache_lock:
+            for author_detail in fetched:
+                if author_detail and author_detail.get("authorId"):
+                    self._author_cache[author_detail["authorId"]] = author_detail
+                    self._author_cache.move_to_end(author_detail["authorId"])
+            while len(self._author_cache) > AUTHOR_CACHE_SIZE:
+                self._author_cache.popitem(last=False)
+
+            author_details = []
+            for author_id in author_ids:
+                author_detail = self._author_cache.get(author_id)
+                if author_detail:
+                    self._author_cache.move_to_end(author_id)
+                    author_details.append(author_detail)
+        return author_details
 
     # For all the papers(csv and recommended_papers)
     def process_paper(
@@ -175,188 +148,164 @@ class DataFetcher:
         topic_id: int,
         use_for_rec: bool,
         paper_type: str = "positive",
+        recommended_papers: Optional[List[Dict]] = None,
     ):
-        """Process a single paper with all related data"""
+        """Process a single paper with all related data.
+
+        recommended_papers can be passed in when they were already fetched;
+        otherwise they are requested here.
+        """
         try:
             paper_id = paper_data["paperId"]
-            print(f"Processing paper {paper_id}")
+            logger.debug("Processing paper %s", paper_id)
 
             # Step 1: Create article object and add basic details
             article = Article(paper_id, use_for_recommendation=use_for_rec)
             add_paper_details(article, paper_data)
 
-            # Step 2: Store the paper first
-            print("Storing paper basic details...")
-            try:
-                self.db.insert_paper(article)
-            except Exception as e:
-                print(f"Error storing paper: {e}")
-                return None
-
-            # Step 3: Process authors in smaller batches
-            print("Processing authors...")
-            authors = []
-            author_batch_size = 4
-
-            author_data_list = paper_data.get("authors", [])
-            for i in range(0, len(author_data_list), author_batch_size):
-                batch = author_data_list[i : i + author_batch_size]
-                print(f"Processing author batch {i//author_batch_size + 1}")
-
-                for idx, author_data in enumerate(batch, i + 1):
-                    try:
-                        author_id = author_data.get("authorId") or author_data.get(
-                            "name"
-                        )
-                        if not author_id:
-                            continue
-
-                        author = Author(
-                            author_id=author_id, author_name=author_data.get("name")
-                        )
-                        authors.append(author)
-
-                        print(f"Storing author {idx}: {author.author_name}")
-                        self.db.insert_author(author)
-                        self.db.link_paper_author(paper_id, author_id, idx)
-
-                    except Exception as e:
-                        print(f"Error processing author {idx}: {e}")
-                        continue
-
-                time.sleep(1)  # Small delay between batches
-
-            article.authors = authors
-
-            # Step 4: Update h-index in batches
+            # Step 2: Collect the authors
+            logger.debug("Processing authors...")
+            for author_data in paper_data.get("authors", []):
+                author_id = author_data.get("authorId") or author_data.get("name")
+                if not author_id:
+                    continue
+                article.authors.append(
+                    Author(author_id=author_id, author_name=author_data.get("name"))
+                )
+
+            # Step 3: Update h-index from the authors' details
             if article.authors:
-                print("Fetching author details...")
-                author_ids = [a.author_id for a in article.authors]
-
-                for i in range(0, len(author_ids), author_batch_size):
-                    batch_ids = author_ids[i : i + author_batch_size]
-                    print(f"Fetching details for authors {i+1} to {i+len(batch_ids)}")
-                    author_details = get_author_details(batch_ids)
-                    time.sleep(1)  # Rate limiting
-
-                    # Update each author in the batch
-                    for author_detail in author_details:
-                        if author_detail:
-                            self.update_single_author(author_detail)
-
-                # Final h-index update for the paper
+                logger.debug("Fetching details for %d authors...", len(article.authors))
+                author_details = self.get_author_details(
+                    [a.author_id for a in article.authors]
+                )
                 update_h_index(article, author_details)
-                self.db.insert_paper(article)
+
+            # Step 4: Store the paper, its authors and their links once every
+            # field is final; the writer gets copies, never the live objects
+            logger.debug("Storing paper and %d authors...", len(article.authors))
+            self.submit(self.db.insert_paper, _snapshot_article(article))
+            self.submit(
+                self.db.insert_authors_bulk,
+                [replace(author) for author in article.authors],
+            )
+            self.submit(
+                self.db.link_paper_authors_bulk,
+                [
+                    (paper_id, author.author_id, idx)
+                    for idx, author in enumerate(article.authors, 1)
+                ],
+            )
 
             # Step 5: Link to topic
-            print("Linking paper to topic...")
-            self.db.link_topic_paper(topic_id, paper_id, paper_type, use_for_rec)
+            logger.debug("Linking paper to topic...")
+            self.submit(
+                self.db.link_topic_paper, topic_id, paper_id, paper_type, use_for_rec
+            )
 
             # Step 6: Process and store recommendations
             if use_for_rec and paper_type == "positive":
-                print("Fetching paper recommendations...")
-                recommended_papers = add_recommendations_to_positive_articles(paper_id)
+                if recommended_papers is None:
+                    logger.debug("Fetching paper recommendations...")
+                    recommended_papers = add_recommendations_to_positive_articles(
+                        paper_id
+                    )
 
                 if recommended_papers:
-                    print(f"Found {len(recommended_papers)} recommendations")
-                    for idx, rec_paper in enumerate(recommended_papers, 1):
-                        try:
-                            # Skip if paper ID is missing
-                            if not rec_paper.get("paperId"):
-                                continue
-
-                            # Create article object for recommendation
-                            rec_article = Article(rec_paper["paperId"])
-                            add_paper_details(rec_article, rec_paper)
-
-                            # First store the recommended paper
-                            try:
-                                print(f"Storing recommended paper {idx}...")
-                                self.db.insert_paper(rec_article)
-                            except Exception as e:
-                                print(
-                                    f"Warning: Could not store recommended paper: {e}"
-                                )
-                                continue
-
-                            # Then process authors for recommended paper
-                            print(f"Processing authors for recommendation {idx}...")
-                            authors = []
-                            author_data_list = rec_paper.get("authors", [])
-
-                            for author_idx, author_data in enumerate(
-                                author_data_list, 1
-                            ):
-                                try:
-                                    author_id = author_data.get(
-                                        "authorId"
-                                    ) or author_data.get("name")
-                                    if not author_id:
-                                        continue
-
-                                    author = Author(
-                                        author_id=author_id,
-                                        author_name=author_data.get("name"),
-                                    )
-                                    authors.append(author)
-
-                                    # Store author and link to paper
-                                    self.db.insert_author(author)
-                                    self.db.link_paper_author(
-                                        rec_article.article_id, author_id, author_idx
-                                    )
-
-                                except Exception as e:
-                                    print(
-                                        f"Error processing author {author_idx} for recommendation {idx}: {e}"
-                                    )
-                                    continue
-
-                            rec_article.authors = authors
-
-                            # Update h-index for recommended paper
-                            if rec_article.authors:
-                                author_ids = [a.author_id for a in rec_article.authors]
-                                author_details = get_author_details(author_ids)
-
-                                # Update each author's details
-                                for author_detail in author_details:
-                                    if author_detail:
-                                        self.update_single_author(author_detail)
-
-                                # Calculate and update h-index
-                                update_h_index(rec_article, author_details)
-                                self.db.insert_paper(rec_article)
-
-                            # Store the recommendation relationship
-                            print(
-                                f"Storing recommendation {idx}: {rec_article.info.title} (h-index: {rec_article.info.h_index})"
-                            )
-                            self.db.insert_paper_recommendations(
-                                paper_id, rec_article.article_id, idx
-                            )
-
-                        except Exception as e:
-                            print(f"Error processing recommendation {idx}: {e}")
-                            continue
+                    logger.debug("Found %d recommendations", len(recommended_papers))
+                    queued = self.process_recommendations(paper_id, recommended_papers)
+                    logger.debug("Queued %d recommendations for storage", queued)
                 else:
-                    print("No recommendations found")
+                    logger.debug("No recommendations found")
 
             return article
 
-        except Exception as e:
-            print(f"Error details: {str(e)}")
+        except (Error, KeyError):
+            logger.exception("Failed to process paper %s", paper_data.get("paperId"))
             return None
 
-    def update_single_author(self, author_detail):
-        """Update a single author's details"""
-        try:
-            author = Author(
-                author_id=author_detail["authorId"],
-                author_name=author_detail.get("name"),
-                h_index=author_detail.get("hIndex"),
-                citation_count=author_detail.get("citationCount"),
+    def process_recommendations(self, paper_id: str, recommended_papers: List[Dict]):
+        """Build the recommended papers and queue them for storage in batches.
+
+        The authors of all recommendations are looked up with one batched
+        get_author_details call instead of one call per recommended paper.
+        """
+        prepared = []
+        for idx, rec_paper in enumerate(recommended_papers, 1):
+            try:
+                # Skip if paper ID is missing
+                if not rec_paper.get("paperId"):
+                    continue
+                prepared.append((idx, self._build_recommendation(rec_paper)))
+            except KeyError as e:
+                logger.warning("Error processing recommendation %d: %s", idx, e)
+                continue
+
+        # Update h-index for the recommended papers
+        author_ids = list(
+            dict.fromkeys(
+                author.author_id
+                for _, rec_article in prepared
+                for author in rec_article.authors
+            )
+        )
+        if author_ids:
+            details_by_id = {
+                detail.get("authorId"): detail
+                for detail in self.get_author_details(author_ids)
+            }
+            for _, rec_article in prepared:
+                if rec_article.authors:
+                    update_h_index(
+                        rec_article,
+                        [
+                            details_by_id[author.author_id]
+                            for author in rec_article.authors
+                            if author.author_id in details_by_id
+                        ],
+                    )
+
+        queued = 0
+        for start in range(0, len(prepared), REC_BATCH_SIZE):
+            batch = prepared[start : start + REC_BATCH_SIZE]
+            queued += self._store_recommendation_batch(paper_id, batch)
+        return queued
+
+    @staticmethod
+    def _build_recommendation(rec_paper: Dict) -> Article:
+        """Build a recommended article and its authors from the API response"""
+        rec_article = Article(rec_paper["paperId"])
+        add_paper_details(rec_article, rec_paper)
+
+        for author_data in rec_paper.get("authors", []):
+            author_id = author_data.get("authorId") or author_data.get("name")
+            if not author_id:
+                continue
+            rec_article.authors.append(
+                Author(author_id=author_id, author_name=author_data.get("name"))
             )
-            self.db.insert_author(author)
-        except Exception as e:
-            print(f"Error updating author {author_detail.get('authorId')}: {e}")
+        return rec_article
+
+    def _store_recommendation_batch(self, paper_id: str, batch) -> int:
+        """Queue a batch of recommended papers, authors and relationships"""
+        logger.debug("Queueing batch of %d recommended papers...", len(batch))
+        self.submit(
+            self.db.insert_papers_bulk, [rec_article for _, rec_article in batch]
+        )
+        self.submit(
+            self.db.insert_authors_bulk,
+            [author for _, rec_article in batch for author in rec_article.authors],
+        )
+        self.submit(
+            self.db.link_paper_authors_bulk,
+            [
+                (rec_article.article_id, author.author_id, author_idx)
+                for _, rec_article in batch
+                for author_idx, author in enumerate(rec_article.authors, 1)
+            ],
+        )
+        self.submit(
+            self.db.insert_paper_recommendations_bulk,
+            [(paper_id, rec_article.article_id, idx) for idx, rec_article in batch],
+        )
+        return len(batch)
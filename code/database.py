@@ -1,13 +1,153 @@
 #!/usr/bin/env python3
 
+import os
+import random
+import threading
 import time
-from typing import Dict, List, Optional
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set
 
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
+from mysql.connector.errors import PoolError
+
+# Authors seen only by name must not rewrite the indexed h_index/citation_count
+# columns, so the UPDATE clause lists just the columns that were fetched.
+AUTHOR_COLUMNS = ("id", "name", "h_index", "citation_count")
+INSERT_AUTHOR_NAME_ONLY = """
+    INSERT INTO authors (id, name, h_index, citation_count)
+    {source}
+    ON DUPLICATE KEY UPDATE
+        name = COALESCE(new.name, authors.name)
+"""
+INSERT_AUTHOR_FULL = """
+    INSERT INTO authors (id, name, h_index, citation_count)
+    {source}
+    ON DUPLICATE KEY UPDATE
+        name = COALESCE(new.name, authors.name),
+        h_index = new.h_index,
+        citation_count = new.citation_count
+"""
+# Retry backoff: full jitter over an exponential ceiling whose base adapts per
+# operation, growing by (1 + alpha) on each abort and shrinking on each commit.
+BACKOFF_BASE = 1.0
+BACKOFF_MIN = 0.001
+BACKOFF_MAX = 30.0
+BACKOFF_ALPHA = 0.5
+
+PAPER_COLUMNS = (
+    "id",
+    "title",
+    "abstract",
+    "journal",
+    "url",
+    "publication_date",
+    "citation_count",
+    "h_index",
+)
+INSERT_PAPER = """
+    INSERT INTO papers (id, title, abstract, journal, url,
+                        publication_date, citation_count, h_index)
+    {source}
+    ON DUPLICATE KEY UPDATE
+        title = new.title,
+        abstract = new.abstract,
+        journal = new.journal,
+        url = new.url,
+        publication_date = new.publication_date,
+        citation_count = new.citation_count,
+        h_index = new.h_index
+"""
+
+LINK_COLUMNS = ("paper_id", "author_id", "author_order")
+LINK_PAPER_AUTHOR = """
+    INSERT INTO paper_authors (paper_id, author_id, author_order)
+    {source}
+    ON DUPLICATE KEY UPDATE author_order = new.author_order
+"""
+
+RECOMMENDATION_COLUMNS = (
+    "source_paper_id",
+    "recommended_paper_id",
+    "recommendation_order",
+)
+INSERT_RECOMMENDATION = """
+    INSERT INTO paper_recommendations
+        (source_paper_id, recommended_paper_id, recommendation_order)
+    {source}
+    ON DUPLICATE KEY UPDATE recommendation_order = new.recommendation_order
+"""
+
+TOPIC_PAPER_COLUMNS = ("topic_id", "paper_id", "paper_type", "use_for_recommendation")
+LINK_TOPIC_PAPER = """
+    INSERT INTO topic_papers (topic_id, paper_id, paper_type, use_for_recommendation)
+    {source}
+    ON DUPLICATE KEY UPDATE
+        paper_type = new.paper_type,
+        use_for_recommendation = new.use_for_recommendation
+"""
+
+# Non-key indexes from init/01_schema.sql: name -> (table, columns).
+# Optionally dropped during a bulk load and rebuilt once at the end.
+SECONDARY_INDEXES = {
+    "idx_papers_date": ("papers", "publication_date"),
+    "idx_papers_citations": ("papers", "citation_count"),
+    "idx_authors_hindex": ("authors", "h_index"),
+    "idx_topic_papers_type": ("topic_papers", "paper_type"),
+}
+
+# Connections per pool; the connector caps pools at 32
+POOL_SIZE = int(os.getenv("POOL_SIZE", "5"))
+
+# Pools are shared by every DatabaseManager with the same settings, so building
+# a manager (the dashboards do on every rerun) does not open new connections
+_pools: Dict[tuple, pooling.MySQLConnectionPool] = {}
+_pools_lock = threading.Lock()
+# Server connection ids whose session variables are already set (pooled
+# sessions outlive the managers using them), and those checked out with
+# per-row checks relaxed for a bulk load
+_initialized_connections: Set[int] = set()
+_bulk_connections: Set[int] = set()
+_connections_lock = threading.Lock()
+
+
+def _get_pool(config: Dict) -> pooling.MySQLConnectionPool:
+    """Return the pool for config, creating it on first use"""
+    key = tuple(sorted(config.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = pooling.MySQLConnectionPool(
+                pool_name=f"scholar{len(_pools)}",
+                pool_size=POOL_SIZE,
+                pool_reset_session=False,
+                **config,
+            )
+        return pool
+
+
+def _values_source(width: int, count: int) -> str:
+    """VALUES clause with count rows of width placeholders, aliased as new"""
+    row = "(" + ", ".join(["%s"] * width) + ")"
+    return "VALUES " + ", ".join([row] * count) + " AS new"
 
 
 class DatabaseManager:
+    __slots__ = (
+        "config",
+        "_local",
+        "_backoff",
+        "_backoff_lock",
+        "_topic_cache",
+        "_author_seen",
+        "_link_seen",
+        "_seen_lock",
+        "bulk_batch_size",
+        "batch_size",
+        "commit_size",
+        "_bulk_load",
+    )
+
     def __init__(self):
         self.config = {
             "host": "localhost",
@@ -16,25 +156,194 @@ class DatabaseManager:
             "database": "scholar_db",
             "port": 3306,
             "connect_timeout": 60,
-            "pool_size": 5,
-            "pool_reset_session": True,
         }
+        # Cursor of the transaction opened by transaction() on each thread
+        self._local = threading.local()
+        # Learned backoff base (seconds) per operation type
+        self._backoff: Dict[str, float] = {}
+        self._backoff_lock = threading.Lock()
+        # Topic name -> id; CSVs only have a handful of topics
+        self._topic_cache: Dict[str, int] = {}
+        # Authors and (paper_id, author_id) links already committed, so rows
+        # shared by related papers are not sent again
+        self._author_seen: Set[str] = set()
+        self._link_seen: Set[tuple] = set()
+        self._seen_lock = threading.Lock()
+
+        # Bulk-load knobs: rows per multi-row INSERT, INSERTs sent per
+        # executemany call, and INSERTs per commit outside transaction().
+        # Retune for the server's max_allowed_packet and the row width.
+        self.bulk_batch_size = int(os.getenv("BULK_BATCH_SIZE", "40"))
+        self.batch_size = int(os.getenv("BULK_STATEMENTS_PER_BATCH", "1"))
+        self.commit_size = int(os.getenv("BULK_COMMIT_SIZE", "10"))
+        # While a bulk load runs, sessions skip unique and foreign key checks
+        self._bulk_load = False
 
     def get_connection(self):
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            # Set session variables to help with timeouts
-            cursor.execute("SET SESSION wait_timeout=600")
-            cursor.execute("SET SESSION interactive_timeout=600")
-            cursor.close()
+            try:
+                conn = _get_pool(self.config).get_connection()
+            except PoolError:
+                # Every pooled connection is checked out; a short-lived
+                # unpooled one is better than failing the caller
+                conn = mysql.connector.connect(**self.config)
+            self._init_session(conn)
+            self._relax_bulk_session(conn)
             return conn
         except Error as e:
             print(f"Error connecting to MySQL: {e}")
             raise
 
+    def _init_session(self, conn):
+        """Set session variables once per physical connection, not per checkout"""
+        with _connections_lock:
+            if conn.connection_id in _initialized_connections:
+                return
+        cursor = conn.cursor()
+        # Set session variables to help with timeouts
+        cursor.execute("SET SESSION wait_timeout=600, interactive_timeout=600")
+        cursor.close()
+        with _connections_lock:
+            _initialized_connections.add(conn.connection_id)
+
+    def _set_row_checks(self, conn, value: int) -> None:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SET SESSION unique_checks={value}, foreign_key_checks={value}"
+        )
+        cursor.close()
+
+    def _relax_bulk_session(self, conn):
+        """Turn per-row checks off while a bulk load runs"""
+        if not self._bulk_load:
+            return
+        self._set_row_checks(conn, 0)
+        with _connections_lock:
+            _bulk_connections.add(conn.connection_id)
+
+    def _release(self, conn):
+        """Restore per-row checks on a relaxed session, then return conn to
+        the pool, so the next borrower never inherits them switched off"""
+        with _connections_lock:
+            relaxed = conn.connection_id in _bulk_connections
+            _bulk_connections.discard(conn.connection_id)
+        try:
+            if relaxed:
+                self._set_row_checks(conn, 1)
+        finally:
+            conn.close()
+
+    def disable_secondary_indexes(self) -> None:
+        """Drop the secondary indexes and relax session checks for a bulk load.
+
+        The only unique secondary key, topics.name, is protected by the topic
+        cache sending each name at most once.
+        """
+
+        def operation(cursor):
+            existing = self._existing_indexes(cursor)
+            for name, (table, _) in SECONDARY_INDEXES.items():
+                if (table, name) in existing:
+                    cursor.execute(f"ALTER TABLE {table} DROP INDEX {name}")
+
+        self.execute_with_retry(operation)
+        self._bulk_load = True
+
+    def enable_secondary_indexes(self) -> None:
+        """Create every secondary index that is missing.
+
+        Works from the schema rather than from what this process dropped, so
+        it also restores indexes left behind by an interrupted bulk load.
+        """
+        self._bulk_load = False
+
+        def operation(cursor):
+            existing = self._existing_indexes(cursor)
+            for name, (table, columns) in SECONDARY_INDEXES.items():
+                if (table, name) not in existing:
+                    cursor.execute(f"CREATE INDEX {name} ON {table}({columns})")
+
+        self.execute_with_retry(operation)
+
+    @staticmethod
+    def _existing_indexes(cursor) -> Set[tuple]:
+        """(table, index) pairs present in the current schema"""
+        cursor.execute(
+            """
+            SELECT DISTINCT table_name, index_name FROM information_schema.statistics
+            WHERE table_schema = DATABASE()
+            """
+        )
+        return set(cursor.fetchall())
+
+    @contextmanager
+    def dict_cursor(self):
+        """Cursor returning rows as dicts for read queries. The cursor and its
+        connection are closed however the block exits."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Run every write issued on this thread in a single transaction"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        self._local.cursor = cursor
+        self._local.pending_seen = []
+        # Query text -> server-side prepared cursor, so each INSERT shape is
+        # parsed once per transaction and later executes only send parameters
+        self._local.conn = conn
+        self._local.prepared = {}
+        try:
+            yield cursor
+            conn.commit()
+            for seen, keys in self._local.pending_seen:
+                self._remember(seen, keys)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            for prepared in self._local.prepared.values():
+                prepared.close()
+            self._local.cursor = None
+            self._local.pending_seen = None
+            self._local.conn = None
+            self._local.prepared = None
+            cursor.close()
+            self._release(conn)
+
+    def _adjust_backoff(self, op_type: str, aborted: bool) -> float:
+        """Grow the backoff base of op_type on abort, shrink it on commit"""
+        with self._backoff_lock:
+            base = self._backoff.get(op_type, BACKOFF_BASE)
+            if aborted:
+                base *= 1 + BACKOFF_ALPHA
+            else:
+                base /= 1 + BACKOFF_ALPHA
+            base = min(BACKOFF_MAX, max(BACKOFF_MIN, base))
+            self._backoff[op_type] = base
+            return base
+
+    def _backoff_delay(self, op_type: str, attempt: int) -> float:
+        """Full-jitter delay so concurrent retries do not collide"""
+        base = self._adjust_backoff(op_type, aborted=True)
+        return random.uniform(0, min(BACKOFF_MAX, base * 2**attempt))
+
     def execute_with_retry(self, operation, max_retries=3):
         """Execute database operation with retry logic"""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is not None:
+            # Inside transaction(): the caller commits or rolls back
+            return operation(cursor)
+
+        op_type = operation.__qualname__.split(".<locals>")[0]
         last_error = None
         for attempt in range(max_retries):
             conn = None
@@ -44,6 +353,8 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 result = operation(cursor)
                 conn.commit()
+                if op_type in self._backoff:
+                    self._adjust_backoff(op_type, aborted=False)
                 return result
             except mysql.connector.Error as e:
                 last_error = e
@@ -53,9 +364,9 @@ class DatabaseManager:
                     conn.rollback()
                 if e.errno == 1205:  # Lock timeout error
                     if attempt < max_retries - 1:
-                        wait_time = min(2**attempt, 30)  # Cap wait time at 30 seconds
+                        wait_time = self._backoff_delay(op_type, attempt)
                         print(
-                            f"Lock timeout, retrying in {wait_time} seconds... (attempt {attempt + 1})"
+                            f"Lock timeout, retrying in {wait_time:.2f} seconds... (attempt {attempt + 1})"
                         )
                         time.sleep(wait_time)
                         continue
@@ -67,9 +378,9 @@ class DatabaseManager:
                 if conn:
                     conn.rollback()
                 if attempt < max_retries - 1:
-                    wait_time = min(2**attempt, 30)
+                    wait_time = self._backoff_delay(op_type, attempt)
                     print(
-                        f"Database error: {e}, retrying in {wait_time} seconds... (attempt {attempt + 1})"
+                        f"Database error: {e}, retrying in {wait_time:.2f} seconds... (attempt {attempt + 1})"
                     )
                     time.sleep(wait_time)
                     continue
@@ -78,95 +389,188 @@ class DatabaseManager:
                 if cursor:
                     cursor.close()
                 if conn:
-                    conn.close()
+                    self._release(conn)
         if last_error:
             raise last_error
 
+    def _statement_cursor(self, cursor, query: str):
+        """Prepared cursor for query inside transaction(), cursor otherwise"""
+        prepared = getattr(self._local, "prepared", None)
+        if prepared is None:
+            return cursor
+        statement = prepared.get(query)
+        if statement is None:
+            statement = prepared[query] = self._local.conn.cursor(prepared=True)
+        return statement
+
+    def _remember(self, seen: set, keys) -> None:
+        """Record written keys, deferring to commit inside transaction()"""
+        pending = getattr(self._local, "pending_seen", None)
+        if pending is not None:
+            pending.append((seen, keys))
+            return
+        with self._seen_lock:
+            seen.update(keys)
+
+    def _unseen(self, seen: set, keys) -> set:
+        with self._seen_lock:
+            return set(keys) - seen
+
     def insert_topic(self, topic_name: str) -> int:
         """Insert a topic and return its ID with retry logic"""
+        if topic_name in self._topic_cache:
+            return self._topic_cache[topic_name]
 
         def operation(cursor):
-            # First try to find if topic exists
-            cursor.execute("SELECT id FROM topics WHERE name = %s", (topic_name,))
-            result = cursor.fetchone()
+            # LAST_INSERT_ID(id) makes lastrowid the existing id on duplicates
+            cursor.execute(
+                """
+                INSERT INTO topics (name) VALUES (%s)
+                ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
+            """,
+                (topic_name,),
+            )
+            return cursor.lastrowid
 
-            if result:
-                return result[0]
+        topic_id = self.execute_with_retry(operation)
+        self._topic_cache[topic_name] = topic_id
+        return topic_id
 
-            # If not exists, insert new topic
-            cursor.execute("INSERT INTO topics (name) VALUES (%s)", (topic_name,))
-            cursor.execute("SELECT id FROM topics WHERE name = %s", (topic_name,))
-            return cursor.fetchone()[0]
+    def _execute_multi_row(self, cursor, template: str, width: int, rows: List[tuple]):
+        """Execute template as multi-row INSERTs of bulk_batch_size rows each"""
+        chunks = [
+            rows[start : start + self.bulk_batch_size]
+            for start in range(0, len(rows), self.bulk_batch_size)
+        ]
+        full = [chunk for chunk in chunks if len(chunk) == self.bulk_batch_size]
+        rest = [chunk for chunk in chunks if len(chunk) < self.bulk_batch_size]
 
-        return self.execute_with_retry(operation)
+        # Full chunks share one statement text, so they can go batch_size at a time
+        query = template.format(source=_values_source(width, self.bulk_batch_size))
+        for start in range(0, len(full), self.batch_size):
+            params = [
+                tuple(value for values in chunk for value in values)
+                for chunk in full[start : start + self.batch_size]
+            ]
+            statement = self._statement_cursor(cursor, query)
+            if len(params) == 1:
+                statement.execute(query, params[0])
+            else:
+                statement.executemany(query, params)
+
+        for chunk in rest:
+            query = template.format(source=_values_source(width, len(chunk)))
+            self._statement_cursor(cursor, query).execute(
+                query, tuple(value for values in chunk for value in values)
+            )
+
+    def _execute_bulk(self, template: str, width: int, rows: List[tuple]):
+        """Upsert rows with multi-row INSERTs, committing every commit_size"""
+        rows_per_commit = self.bulk_batch_size * self.commit_size
+        for start in range(0, len(rows), rows_per_commit):
+            group = rows[start : start + rows_per_commit]
+
+            def operation(cursor, group=group):
+                self._execute_multi_row(cursor, template, width, group)
+
+            self.execute_with_retry(operation)
+
+    @staticmethod
+    def _paper_values(article_obj) -> tuple:
+        return (
+            article_obj.article_id,
+            article_obj.info.title,
+            article_obj.info.abstract,
+            article_obj.info.journal,
+            article_obj.info.url,
+            article_obj.info.publication_date,
+            article_obj.info.citation_count,
+            article_obj.info.h_index,
+        )
 
     def insert_paper(self, article_obj) -> None:
         """Insert or update paper details with retry logic"""
 
         def operation(cursor):
-            query = """
-                INSERT INTO papers (id, title, abstract, journal, url, 
-                                  publication_date, citation_count, h_index)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    title = VALUES(title),
-                    abstract = VALUES(abstract),
-                    journal = VALUES(journal),
-                    url = VALUES(url),
-                    publication_date = VALUES(publication_date),
-                    citation_count = VALUES(citation_count),
-                    h_index = VALUES(h_index)
-            """
-            values = (
-                article_obj.article_id,
-                article_obj.info.title,
-                article_obj.info.abstract,
-                article_obj.info.journal,
-                article_obj.info.url,
-                article_obj.info.publication_date,
-                article_obj.info.citation_count,
-                article_obj.info.h_index,
+            query = INSERT_PAPER.format(source=_values_source(len(PAPER_COLUMNS), 1))
+            self._statement_cursor(cursor, query).execute(
+                query, self._paper_values(article_obj)
             )
-            cursor.execute(query, values)
 
         return self.execute_with_retry(operation)
 
-    def insert_author(self, author_obj) -> None:
-        """Insert or update author with retry logic"""
+    def update_paper_h_index(self, paper_id: str, h_index: float) -> None:
+        """Store a recomputed h-index and mark the paper as checked.
+
+        updated_at is set explicitly: ON UPDATE CURRENT_TIMESTAMP does not
+        fire when the h-index comes out unchanged.
+        """
 
         def operation(cursor):
-            query = """
-                INSERT INTO authors (id, name, h_index, citation_count)
-                VALUES (%s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    name = COALESCE(VALUES(name), name),
-                    h_index = COALESCE(VALUES(h_index), h_index),
-                    citation_count = COALESCE(VALUES(citation_count), citation_count)
-            """
-            values = (
-                author_obj.author_id,
-                author_obj.author_name,
-                author_obj.h_index,
-                author_obj.citation_count,
+            cursor.execute(
+                """
+                UPDATE papers SET h_index = %s, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+                """,
+                (h_index, paper_id),
             )
-            cursor.execute(query, values)
 
         return self.execute_with_retry(operation)
 
-    def link_paper_author(
-        self, paper_id: str, author_id: str, author_order: int = 1
-    ) -> None:
-        """Create paper-author relationship with retry logic"""
+    def insert_papers_bulk(self, articles: List) -> None:
+        """Insert or update many papers with multi-row statements"""
+        self._execute_bulk(
+            INSERT_PAPER,
+            len(PAPER_COLUMNS),
+            [self._paper_values(article_obj) for article_obj in articles],
+        )
 
-        def operation(cursor):
-            query = """
-                INSERT INTO paper_authors (paper_id, author_id, author_order)
-                VALUES (%s, %s, %s)
-                ON DUPLICATE KEY UPDATE author_order = VALUES(author_order)
-            """
-            cursor.execute(query, (paper_id, author_id, author_order))
+    @staticmethod
+    def _has_author_details(author_obj) -> bool:
+        return author_obj.h_index is not None or author_obj.citation_count is not None
 
-        return self.execute_with_retry(operation)
+    @staticmethod
+    def _author_values(author_obj) -> tuple:
+        return (
+            author_obj.author_id,
+            author_obj.author_name,
+            author_obj.h_index,
+            author_obj.citation_count,
+        )
+
+    def insert_authors_bulk(self, authors: List) -> None:
+        """Insert or update many authors with multi-row statements per form"""
+        full = [a for a in authors if self._has_author_details(a)]
+        # Name-only rows are skipped for authors that are already stored
+        unseen = self._unseen(
+            self._author_seen,
+            [a.author_id for a in authors if not self._has_author_details(a)],
+        )
+        name_only = {
+            a.author_id: a
+            for a in authors
+            if a.author_id in unseen and not self._has_author_details(a)
+        }
+        for template, rows in (
+            (INSERT_AUTHOR_NAME_ONLY, name_only.values()),
+            (INSERT_AUTHOR_FULL, full),
+        ):
+            self._execute_bulk(
+                template,
+                len(AUTHOR_COLUMNS),
+                [self._author_values(author_obj) for author_obj in rows],
+            )
+        self._remember(self._author_seen, [a.author_id for a in authors])
+
+    def link_paper_authors_bulk(self, links: List[tuple]) -> None:
+        """Create many (paper_id, author_id, author_order) links at once"""
+        # One row per (paper_id, author_id); the last order wins, as it would
+        # through ON DUPLICATE KEY UPDATE
+        links = list({link[:2]: link for link in links}.values())
+        unseen = self._unseen(self._link_seen, [link[:2] for link in links])
+        links = [link for link in links if link[:2] in unseen]
+        self._execute_bulk(LINK_PAPER_AUTHOR, len(LINK_COLUMNS), links)
+        self._remember(self._link_seen, [link[:2] for link in links])
 
     def link_topic_paper(
         self,
@@ -178,35 +582,17 @@ class DatabaseManager:
         """Link paper to topic with retry logic"""
 
         def operation(cursor):
-            query = """
-                INSERT INTO topic_papers 
-                    (topic_id, paper_id, paper_type, use_for_recommendation)
-                VALUES (%s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    paper_type = VALUES(paper_type),
-                    use_for_recommendation = VALUES(use_for_recommendation)
-            """
-            cursor.execute(
+            query = LINK_TOPIC_PAPER.format(
+                source=_values_source(len(TOPIC_PAPER_COLUMNS), 1)
+            )
+            self._statement_cursor(cursor, query).execute(
                 query, (topic_id, paper_id, paper_type, use_for_recommendation)
             )
 
         return self.execute_with_retry(operation)
 
-    def insert_paper_recommendations(
-        self, source_paper_id: str, recommended_paper_id: str, recommendation_order: int
-    ) -> None:
-        """Store paper recommendations with retry logic"""
-
-        def operation(cursor):
-            query = """
-                INSERT INTO paper_recommendations 
-                    (source_paper_id, recommended_paper_id, recommendation_order)
-                VALUES (%s, %s, %s)
-                ON DUPLICATE KEY UPDATE 
-                    recommendation_order = VALUES(recommendation_order)
-            """
-            cursor.execute(
-                query, (source_paper_id, recommended_paper_id, recommendation_order)
-            )
-
-        return self.execute_with_retry(operation)
+    def insert_paper_recommendations_bulk(self, rec_rows: List[tuple]) -> None:
+        """Store many (source, recommended, order) rows with multi-row statements"""
+        self._execute_bulk(
+            INSERT_RECOMMENDATION, len(RECOMMENDATION_COLUMNS), rec_rows
+        )
@@ -6,80 +6,206 @@ and retrieve their details.
 """
 
 
-import csv
+import argparse
+import logging
 import os
-import time
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
 
 import pandas as pd
-from article import Article
-from author import Author
+from api_cache import get_api_cache
 from data_fetcher import DataFetcher
 from database import DatabaseManager
-from jinja2 import Environment, FileSystemLoader
-from topic import Topic
-from utils import (add_negative_articles, add_paper_details,
-                   add_recommendations,
-                   add_recommendations_to_positive_articles,
-                   add_recommended_articles_to_zotero, get_paper_details,
-                   metrics_over_time_js, read_yaml, update_h_index,
-                   update_paper_details, write_yaml)
-
-
-def process_csv_file(csv_path: str, db: DatabaseManager):
-    """Process CSV file with complete data pipeline"""
+from utils import add_recommendations_to_positive_articles, get_paper_details
+
+PAPER_BATCH_SIZE = 500  # Semantic Scholar's paper/batch limit
+REC_FETCH_WORKERS = 8  # Concurrent recommendation requests
+CSV_CHUNK_SIZE = 1000  # CSV rows parsed and processed at a time
+PROGRESS_EVERY = 100  # Rows between INFO progress lines
+# Last path segment of a paper link, without its query string
+PAPER_ID_RE = re.compile(r"([^/?]*)(?:\?.*)?$")
+
+log = logging.getLogger("ingest")
+
+
+def setup_logging(level: int = logging.INFO):
+    """Send timestamped log records to stderr as they are emitted"""
+    logging.basicConfig(level=level, format="%(asctime)s %(levelname)s %(message)s")
+
+
+def process_csv_file(
+    csv_path: str,
+    db: DatabaseManager,
+    *,
+    topic_col: str = "Topic",
+    url_col: Optional[str] = "URL",
+    id_col: str = "PaperId",
+    use_col: str = "Use",
+    type_col: str = "Type",
+    drop_indexes: bool = False,
+):
+    """Process CSV file with complete data pipeline.
+
+    Papers are read from the Semantic Scholar links in url_col, or from the
+    raw paper ids in id_col when url_col is None. type_col is optional.
+    drop_indexes defers secondary index maintenance to one rebuild at the
+    end, which only pays off for large loads.
+    """
     fetcher = DataFetcher(db)
-
-    with open(csv_path, "r", encoding="utf-8-sig") as f:
-        df = pd.read_csv(f)
-        total_papers = len(df)
-        print(f"Found {total_papers} papers to process")
-
-        for index, row in df.iterrows():
-            try:
-                print(f"\nProcessing paper {index + 1}/{total_papers}")
-
-                # Process topic
-                topic = row["Topic"].strip()
-                topic_id = db.insert_topic(topic)
-                print(f"✓ Topic saved: {topic}")
-
-                # Get paper usage and type
-                use_for_rec = str(row["Use"]).strip() == "1"
-                paper_type = row.get("Type", "positive").strip().lower()
-                if paper_type not in ["positive", "negative"]:
-                    paper_type = "positive"
-
-                # Extract paper ID
-                paper_id = row["URL"].strip().split("/")[-1].split("?")[0]
-                print(f"Processing paper ID: {paper_id}")
-
-                # Fetch paper details
-                paper_data = get_paper_details([paper_id])[0]
-                if not paper_data:
-                    print(f"✗ Could not fetch details for paper {paper_id}")
-                    continue
-
-                # Process paper with all related data
-                article = fetcher.process_paper(
-                    paper_data, topic_id, use_for_rec, paper_type
+    # Map the CSV's column names onto the ones process_csv_chunk expects
+    columns = {
+        topic_col: "Topic",
+        use_col: "Use",
+        type_col: "Type",
+        **({url_col: "URL"} if url_col else {id_col: "paper_id"}),
+    }
+
+    if drop_indexes:
+        db.disable_secondary_indexes()
+    try:
+        # Stream the CSV CSV_CHUNK_SIZE rows at a time, parsing only the
+        # columns the pipeline uses
+        chunks = pd.read_csv(
+            csv_path,
+            encoding="utf-8-sig",
+            usecols=lambda column: column in columns,
+            dtype="string",
+            engine="c",
+            chunksize=CSV_CHUNK_SIZE,
+        )
+        rows_done = 0
+        for chunk in chunks:
+            process_csv_chunk(chunk.rename(columns=columns), db, fetcher, rows_done)
+            rows_done += len(chunk)
+        log.info("Processed %d rows", rows_done)
+    finally:
+        # Wait for the writer thread to commit everything that was queued
+        fetcher.close()
+        # Also restores indexes an interrupted earlier load left dropped
+        db.enable_secondary_indexes()
+
+
+def process_csv_chunk(
+    df: pd.DataFrame, db: DatabaseManager, fetcher: DataFetcher, row_offset: int
+):
+    """Fetch and store the papers of one CSV chunk"""
+    log.info("Processing rows %d-%d", row_offset + 1, row_offset + len(df))
+
+    # Clean every column at once instead of row by row
+    df["row_num"] = range(row_offset + 1, row_offset + 1 + len(df))
+    df["Topic"] = df["Topic"].str.strip()
+    if "URL" in df:
+        df["paper_id"] = df["URL"].str.strip().str.extract(PAPER_ID_RE, expand=False)
+    else:
+        df["paper_id"] = df["paper_id"].str.strip()
+    df["use_for_rec"] = (
+        df["Use"].astype(str).str.strip().str.lower().isin(["1", "true", "yes", "y"])
+    )
+    paper_types = df["Type"] if "Type" in df else pd.Series("positive", df.index)
+    paper_types = paper_types.astype(str).str.strip().str.lower()
+    df["paper_type"] = paper_types.where(
+        paper_types.isin(["positive", "negative"]), "positive"
+    )
+
+    # A blank link or id would fail the whole batch lookup below, so those
+    # rows are skipped here
+    has_id = df["paper_id"].notna() & (df["paper_id"] != "")
+    for row_num in df.loc[~has_id, "row_num"]:
+        log.warning("row %d: no paper id, skipping", row_num)
+    df = df[has_id]
+
+    # Fetch the chunk's paper details up front, PAPER_BATCH_SIZE ids per request
+    paper_ids = df["paper_id"].drop_duplicates().tolist()
+    paper_details = {}
+    for start in range(0, len(paper_ids), PAPER_BATCH_SIZE):
+        batch = paper_ids[start : start + PAPER_BATCH_SIZE]
+        # The batch endpoint answers in request order, with None for misses
+        paper_details.update(zip(batch, get_paper_details(batch)))
+
+    # Recommendation requests are independent HTTP calls, so run them
+    # concurrently; the DB writes stay on the fetcher's writer thread
+    seed_ids = (
+        df.loc[df["use_for_rec"] & (df["paper_type"] == "positive"), "paper_id"]
+        .drop_duplicates()
+        .tolist()
+    )
+    log.info("Fetching recommendations for %d papers...", len(seed_ids))
+    rec_map = {}
+    with ThreadPoolExecutor(max_workers=REC_FETCH_WORKERS) as executor:
+        futures = {
+            executor.submit(add_recommendations_to_positive_articles, seed_id): seed_id
+            for seed_id in seed_ids
+        }
+        for future in as_completed(futures):
+            rec_map[futures[future]] = future.result()
+
+    rows = df[["row_num", "Topic", "paper_id", "use_for_rec", "paper_type"]]
+    for row_num, topic, paper_id, use_for_rec, paper_type in rows.itertuples(
+        index=False, name=None
+    ):
+        try:
+            # Process topic
+            topic_id = db.insert_topic(topic)
+            log.debug("Topic saved: %s", topic)
+
+            paper_data = paper_details.get(paper_id)
+            if not paper_data:
+                log.warning(
+                    "row %d: could not fetch details for paper %s", row_num, paper_id
                 )
+                continue
 
-                if article:
-                    print(f"✓ Successfully processed: {article.info.title}")
-                    print(f"  Authors: {len(article.authors)}")
-                    print(f"  H-index: {article.info.h_index}")
-                else:
-                    print(f"✗ Failed to process paper {paper_id}")
+            # Process paper with all related data
+            article = fetcher.process_paper(
+                paper_data,
+                topic_id,
+                use_for_rec,
+                paper_type,
+                recommended_papers=rec_map.get(paper_id),
+            )
+
+            if article:
+                log.debug(
+                    "row %d %s (authors: %d, h-index: %s)",
+                    row_num,
+                    article.info.title,
+                    len(article.authors),
+                    article.info.h_index,
+                )
+            else:
+                log.warning("row %d: failed to process paper %s", row_num, paper_id)
 
-            except Exception as e:
-                print(f"Error processing row {index + 1}: {e}")
-                continue
+        except Exception:
+            log.exception("Error processing row %d", row_num)
+            continue
+        finally:
+            if row_num % PROGRESS_EVERY == 0:
+                log.info("Processed %d rows", row_num)
 
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore and do not update any cached API responses "
+        "(on disk, in MySQL and in memory)",
+    )
+    parser.add_argument(
+        "--drop-indexes",
+        action="store_true",
+        help="drop secondary indexes during the load and rebuild them at the end "
+        "(faster for large CSVs; the dashboard runs without them meanwhile)",
+    )
+    args = parser.parse_args()
+    if args.no_cache:
+        get_api_cache().enabled = False
+
+    setup_logging(logging.DEBUG if os.getenv("DEBUG") else logging.INFO)
     try:
         # Initialize database connection
-        print("Initializing database connection...")
+        log.info("Initializing database connection...")
         db = DatabaseManager()
 
         # Construct the path to the CSV file
@@ -93,12 +219,12 @@ def main():
         if not os.path.exists(csv_path):
             raise FileNotFoundError(f"CSV file not found at {csv_path}")
 
-        print(f"\nStarting to process CSV file: {csv_path}")
-        process_csv_file(csv_path, db)
-        print("\nCompleted processing papers")
+        log.info("Starting to process CSV file: %s", csv_path)
+        process_csv_file(csv_path, db, drop_indexes=args.drop_indexes)
+        log.info("Completed processing papers")
 
-    except Exception as e:
-        print(f"Error in main execution: {e}")
+    except Exception:
+        log.exception("Error in main execution")
         raise
 
 
@@ -4,18 +4,31 @@
 script to define utility functions
 """
 
+import itertools
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-import matplotlib.pyplot as plt
+import orjson
 import pandas as pd
 import requests
 import yaml
+from api_cache import get_api_cache
 from pyzotero import zotero
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from tenacity import (retry, retry_if_exception, stop_after_attempt,
+                      wait_exponential, wait_random)
+
+# libyaml's C loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as YamlDumper
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeDumper as YamlDumper
+    from yaml import SafeLoader as YamlLoader
 
 FIELDS = "paperId,url,authors,journal,title,"
 FIELDS += "publicationTypes,publicationDate,citationCount,"
@@ -26,44 +39,215 @@ LIBRARY_ID = os.environ.get("LIBRARY_ID")
 ZOTERO_API_KEY = os.environ.get("ZOTERO_API_KEY")
 TEST_COLLECTION_KEY = os.environ.get("TEST_COLLECTION_KEY")
 
+# Concurrent Semantic Scholar requests allowed across all threads
+API_MAX_CONCURRENCY = int(os.environ.get("S2_MAX_CONCURRENCY", "8"))
+_api_slots = threading.BoundedSemaphore(API_MAX_CONCURRENCY)
+# Client-side request rate (per second) and burst the token bucket allows.
+# The default is Semantic Scholar's documented 1 request/s; raise S2_RATE
+# for a key with a higher limit.
+API_RATE = float(os.environ.get("S2_RATE", "1"))
+API_BURST = int(os.environ.get("S2_BURST", "1"))
+# Below this many requests left in the window, calls are spaced out
+RATE_LIMIT_LOW_WATER = 5
+PAPER_BATCH_LIMIT = 500  # Ids per paper/batch request
+AUTHOR_BATCH_LIMIT = 1000  # Ids per author/batch request
+# Author responses carry h-indices, which update_h_indices.py has to see
+# fresh, so they never go through the disk cache
+UNCACHED_ENDPOINT_RE = re.compile(r"/author/")
+
+# Authors without a Semantic Scholar id are keyed by their plain name
+NAME_ONLY_RE = re.compile(r"[A-Za-z ]+")
+
 
 def create_session():
-    """Create a requests session with retry strategy"""
+    """Create a requests session with a pooled adapter"""
     session = requests.Session()
-    retry_strategy = Retry(
-        total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504]
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    # No transport-level retries: _send_api_request retries every transient
+    # failure, so the token bucket sees each attempt
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
     session.mount("https://", adapter)
     return session
 
 
-def handle_api_request(session, endpoint, params=None, json=None, method="GET"):
-    """Handle API requests with rate limiting and retries"""
-    try:
+# Shared by every API helper (and thread) so connections to the Semantic
+# Scholar host are kept alive instead of paying a TLS handshake per call.
+# Created on first use, so importing utils stays cheap.
+_SESSION = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide API session"""
+    global _SESSION
+    if _SESSION is None:
+        with _session_lock:
+            if _SESSION is None:
+                _SESSION = create_session()
+    return _SESSION
+
+
+# Paper details already fetched with the default FIELDS, keyed by requested id;
+# recommendations for overlapping topics keep returning the same papers
+_paper_cache = {}
+_paper_cache_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every API call.
+
+    The rate backs off by 20% on each 429 and creeps back up by 5% per
+    success, never past the configured rate. Rate-limit headers on responses
+    can also pause it before the server starts refusing requests.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            # Going negative reserves the next token, queueing later callers
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0
+            delay = max(delay, self.paused_until - now)
+        if delay > 0:
+            time.sleep(delay)
+
+    def observe(self, headers):
+        """Spread the remaining quota over the time left in the window when
+        X-RateLimit-Remaining runs low"""
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset = float(headers.get("X-RateLimit-Reset", 0))
+        except (KeyError, ValueError):
+            return
+        if remaining >= RATE_LIMIT_LOW_WATER:
+            return
+        # Reset is either an epoch timestamp or seconds until the window resets
+        window_left = reset - time.time() if reset > 1e9 else reset
+        if window_left <= 0:
+            return
+        with self.lock:
+            self.paused_until = max(
+                self.paused_until,
+                time.monotonic() + window_left / max(1, remaining),
+            )
+
+    def slow_down(self):
+        with self.lock:
+            self.rate = max(0.1, self.rate * 0.8)
+
+    def speed_up(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate * 1.05)
+
+
+_bucket = TokenBucket(API_RATE, API_BURST)
+
+
+def _is_transient_error(exc):
+    """Only retry failures that may succeed later (rate limits, 5xx, network)"""
+    if isinstance(exc, requests.HTTPError):
+        status = exc.response.status_code if exc.response is not None else None
+        return status == 429 or (status is not None and status >= 500)
+    return isinstance(exc, (requests.Timeout, requests.ConnectionError))
+
+
+# Jitter keeps threads that hit the same 429 from retrying in lockstep
+_exponential_wait = wait_exponential(multiplier=1, max=60) + wait_random(0, 1)
+
+
+def _retry_wait(retry_state):
+    """Wait as long as a 429's Retry-After asks, else back off exponentially"""
+    response = getattr(retry_state.outcome.exception(), "response", None)
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(int(retry_after), 60)
+    return _exponential_wait(retry_state)
+
+
+@retry(
+    wait=_retry_wait,
+    stop=stop_after_attempt(6),
+    retry=retry_if_exception(_is_transient_error),
+    reraise=True,
+)
+def _send_api_request(session, endpoint, params=None, json=None, method="GET"):
+    """Send a single API request, raising HTTP errors so they can be retried"""
+    _bucket.acquire()
+    # Callers beyond API_MAX_CONCURRENCY queue here instead of sleeping
+    with _api_slots:
         if method == "GET":
             response = session.get(endpoint, params=params, timeout=30)
         else:  # POST
-            response = session.post(endpoint, params=params, json=json, timeout=30)
+            # orjson serialises the (up to 1000-id) batch bodies much faster
+            response = session.post(
+                endpoint,
+                params=params,
+                data=orjson.dumps(json),
+                headers={"Content-Type": "application/json"},
+                timeout=30,
+            )
+    _bucket.observe(response.headers)
+    if response.status_code == 429:
+        _bucket.slow_down()
+    elif response.ok:
+        _bucket.speed_up()
+    response.raise_for_status()
+    return response
+
 
-        if response.status_code == 429:
-            wait_time = int(response.headers.get("Retry-After", 60))
-            print(f"Rate limited. Waiting {wait_time} seconds...")
-            time.sleep(wait_time)
-            return handle_api_request(session, endpoint, params, json, method)
+def fetch_concurrently(fetch, items):
+    """Call fetch on every item from a thread pool, returning results in order.
+
+    Requests are I/O bound, so independent calls overlap instead of running
+    back to back; _api_slots still caps how many are in flight.
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [fetch(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(API_MAX_CONCURRENCY, len(items))) as ex:
+        return list(ex.map(fetch, items))
 
-        response.raise_for_status()
-        time.sleep(1)  # Basic rate limiting
-        return response.json()
 
-    except requests.exceptions.Timeout:
-        print(f"Request to {endpoint} timed out. Retrying...")
-        time.sleep(2)
-        return handle_api_request(session, endpoint, params, json, method)
+def handle_api_request(session, endpoint, params=None, json=None, method="GET"):
+    """Handle API requests with retries; rate limits are handled by backing
+    off on 429 (honouring Retry-After) rather than sleeping after every call"""
+    # Repeat requests within the cache TTL are answered from disk. The cache
+    # logs its own errors and treats them as misses, so a broken cache only
+    # costs the API call
+    cache = get_api_cache()
+    cacheable = not UNCACHED_ENDPOINT_RE.search(endpoint)
+    key = cache.key(method, endpoint, params, json)
+    content = cache.get(key) if cacheable else None
+    if content is not None:
+        try:
+            # Batch responses run to megabytes; orjson parses the raw bytes
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            print(f"Ignoring unreadable cached response for {endpoint}")
 
+    try:
+        content = _send_api_request(session, endpoint, params, json, method).content
+        data = orjson.loads(content)
     except Exception as e:
         print(f"API request failed for {endpoint}: {e}")
         return None
+    if cacheable:
+        cache.set(key, content)
+    return data
 
 
 def add_recommended_articles_to_zotero(topic_name, paper_ids):
@@ -73,46 +257,51 @@ def add_recommended_articles_to_zotero(topic_name, paper_ids):
     else:
         print("Adding recommended articles to Zotero.")
         zot = zotero.Zotero(LIBRARY_ID, LIBRARY_TYPE, ZOTERO_API_KEY)
-        new_items = []
-        for _, paper_obj in paper_ids["recommended"].items():
-            template = zot.item_template("journalArticle")
-            template["title"] = paper_obj.info.title
-            template["creators"] = []
-            for author in paper_obj.authors:
-                template["creators"].append(
+        # Fetch the template once; every field set below is replaced per item
+        base_template = zot.item_template("journalArticle")
+        new_items = [
+            {
+                **base_template,
+                "title": paper_obj.info.title,
+                "creators": [
                     {"creatorType": "author", "name": author.author_name}
-                )
-            template["publicationTitle"] = paper_obj.info.journal
-            template["date"] = paper_obj.info.publication_date
-            template["abstractNote"] = paper_obj.info.abstract
-            template["url"] = paper_obj.info.url
-            template["tags"] = [{"tag": topic_name}]
-            template["collections"] = [TEST_COLLECTION_KEY]
-            new_items.append(template)
-
+                    for author in paper_obj.authors
+                ],
+                "publicationTitle": paper_obj.info.journal,
+                "date": paper_obj.info.publication_date,
+                "abstractNote": paper_obj.info.abstract,
+                "url": paper_obj.info.url,
+                "tags": [{"tag": topic_name}],
+                "collections": [TEST_COLLECTION_KEY],
+            }
+            for paper_obj in paper_ids["recommended"].values()
+        ]
+
+        # Zotero accepts at most 50 items per write
         for i in range(0, len(new_items), 50):
-            zot.check_items(new_items[i : i + 50])
             zot.create_items(new_items[i : i + 50])
 
 
 def add_negative_articles(topic_obj, dic):
     """Add the negative articles to the topic object"""
-    if "negative" not in topic_obj.paper_ids:
-        topic_obj.paper_ids["negative"] = {}
-    for topic in dic:
-        if topic == topic_obj.topic:
-            continue
-        for paper_id in dic[topic].paper_ids["positive"]:
-            if paper_id in topic_obj.paper_ids["negative"]:
-                continue
-            if paper_id in topic_obj.paper_ids["positive"]:
-                continue
-            paper_obj = dic[topic].paper_ids["positive"][paper_id]
-            if paper_obj.use_for_recommendation is False:
-                continue
-            topic_obj.paper_ids["negative"][paper_id] = dic[topic].paper_ids[
-                "positive"
-            ][paper_id]
+    # Positive papers usable for recommendation across all topics; the first
+    # topic listing a paper wins
+    positive_index = {}
+    for other_topic in dic.values():
+        for paper_id, paper_obj in other_topic.paper_ids["positive"].items():
+            if paper_obj.use_for_recommendation is not False:
+                positive_index.setdefault(paper_id, paper_obj)
+    negatives = topic_obj.paper_ids.setdefault("negative", {})
+    new_ids = (
+        positive_index.keys()
+        - topic_obj.paper_ids["positive"].keys()
+        - negatives.keys()
+    )
+    negatives.update(
+        (paper_id, positive_index[paper_id])
+        for paper_id in positive_index
+        if paper_id in new_ids
+    )
     print(
         f'Added {len(topic_obj.paper_ids["negative"])} negative articles for {topic_obj.topic}.'
     )
@@ -120,25 +309,24 @@ def add_negative_articles(topic_obj, dic):
 
 def update_paper_details(topic_obj):
     """Fetch the details of all the papers"""
-    all_paper_ids = list(topic_obj.paper_ids["positive"].keys())
-    all_paper_ids += list(topic_obj.paper_ids["negative"].keys())
-    all_paper_ids = list(set(all_paper_ids))
+    positive = topic_obj.paper_ids["positive"]
+    negative = topic_obj.paper_ids["negative"]
+    # Order-preserving dedupe; the batch endpoint answers in request order
+    all_paper_ids = list(dict.fromkeys([*positive, *negative]))
+    # Id -> the dict holding it; positive wins for ids listed in both
+    owner = {**dict.fromkeys(negative, negative), **dict.fromkeys(positive, positive)}
     all_paper_data = get_paper_details(all_paper_ids)
 
     for paper_id, paper_data in zip(all_paper_ids, all_paper_data):
-        if paper_id == paper_data["paperId"]:
+        if paper_data is None or paper_id == paper_data["paperId"]:
             continue
         print(
             f'Paper ID {paper_id} does not match {paper_data["paperId"]}. Changing the paper ID.'
         )
-        if paper_id in topic_obj.paper_ids["positive"]:
-            topic_obj.paper_ids["positive"][paper_data["paperId"]] = (
-                topic_obj.paper_ids["positive"].pop(paper_id)
-            )
-        elif paper_id in topic_obj.paper_ids["negative"]:
-            topic_obj.paper_ids["negative"][paper_data["paperId"]] = (
-                topic_obj.paper_ids["negative"].pop(paper_id)
-            )
+        # Re-key the paper in place under the id the API returned
+        target = owner.get(paper_id)
+        if target is not None:
+            target[paper_data["paperId"]] = target.pop(paper_id)
     return all_paper_data
 
 
@@ -163,21 +351,21 @@ def update_h_index(article_obj, authors_data):
     authors_h_index_list = []
     total_citations = 0
 
-    for row in authors_data:
+    rows_by_id = {row.get("authorId"): row for row in authors_data if row is not None}
+    for author in article_obj.authors:
+        row = rows_by_id.get(author.author_id)
         if row is None:
             continue
 
-        for author in article_obj.authors:
-            if author.author_id == row.get("authorId"):
-                # Update author information
-                author.h_index = row.get("hIndex")
-                author.name = row.get("name")
-                author.citation_count = row.get("citationCount")
+        # Update author information
+        author.h_index = row.get("hIndex")
+        author.name = row.get("name")
+        author.citation_count = row.get("citationCount")
 
-                if author.h_index is not None:
-                    authors_h_index_list.append(author.h_index)
-                if author.citation_count is not None:
-                    total_citations += author.citation_count
+        if author.h_index is not None:
+            authors_h_index_list.append(author.h_index)
+        if author.citation_count is not None:
+            total_citations += author.citation_count
 
     # Calculate article's h-index based on authors
     if authors_h_index_list:
@@ -221,7 +409,7 @@ def _get_recommendations_direct(article_id, limit=500, fields=FIELDS):
     endpoint = f"https://api.semanticscholar.org/recommendations/v1/papers/forpaper/{article_id}"
     params = {"fields": fields, "limit": limit, "from": "all-cs"}
 
-    session = create_session()
+    session = get_session()
     print(f"Trying direct recommendations for paper {article_id}")
 
     response_data = handle_api_request(session, endpoint, params=params)
@@ -239,7 +427,7 @@ def _get_recommendations_batch(article_id, limit=500, fields=FIELDS):
         "fields": f"references,citations,{fields}",
     }
 
-    session = create_session()
+    session = get_session()
     print(f"Trying batch recommendations for paper {article_id}")
 
     # Get paper details including references and citations
@@ -291,87 +479,115 @@ def _get_recommendations_batch(article_id, limit=500, fields=FIELDS):
 
 
 def get_paper_details(paper_ids, fields=FIELDS):
-    """Get paper details with improved error handling"""
+    """Get paper details in request order (None for unknown papers), only
+    calling the API for papers not fetched before in this process"""
+    cached = {}
+    # --no-cache bypasses this in-process cache as well as the disk cache
+    cacheable = fields == FIELDS and get_api_cache().enabled
+    if cacheable:
+        with _paper_cache_lock:
+            cached = {i: _paper_cache[i] for i in paper_ids if i in _paper_cache}
+    missing = [i for i in dict.fromkeys(paper_ids) if i not in cached]
+    if not missing:
+        return [cached[i] for i in paper_ids]
+
     endpoint = "https://api.semanticscholar.org/graph/v1/paper/batch"
     params = {"fields": fields}
-    json_data = {"ids": list(paper_ids)}
+    session = get_session()
+    print(f"Fetching details for {len(missing)} papers...")
 
-    session = create_session()
-    print(f"Fetching details for {len(paper_ids)} papers...")
+    def fetch(batch_ids):
+        return handle_api_request(
+            session, endpoint, params=params, json={"ids": batch_ids}, method="POST"
+        )
 
-    response_data = handle_api_request(
-        session, endpoint, params=params, json=json_data, method="POST"
-    )
-    if response_data is None:
+    # The endpoint takes PAPER_BATCH_LIMIT ids per request; send them together
+    batches = [
+        missing[start : start + PAPER_BATCH_LIMIT]
+        for start in range(0, len(missing), PAPER_BATCH_LIMIT)
+    ]
+    responses = fetch_concurrently(fetch, batches)
+    if all(response is None for response in responses) and not cached:
         print("Failed to fetch paper details")
         return []
-    return response_data
+
+    fetched = {}
+    for batch_ids, response_data in zip(batches, responses):
+        if response_data is None:
+            print(f"Failed to fetch details for {len(batch_ids)} papers")
+            response_data = [None] * len(batch_ids)
+        fetched.update(zip(batch_ids, response_data))
+    if cacheable:
+        with _paper_cache_lock:
+            _paper_cache.update((i, d) for i, d in fetched.items() if d is not None)
+    return [cached[i] if i in cached else fetched[i] for i in paper_ids]
 
 
 def get_author_details(all_authors_ids):
     """Get author details with improved error handling"""
-    author_details_wo_id = []
-    authors_ids = []
-
-    for author_id in all_authors_ids:
-        if re.fullmatch(r"[A-Za-z ]+", author_id):
-            author_details_wo_id.append(
-                {
-                    "authorId": author_id,
-                    "hIndex": None,
-                    "name": author_id,
-                    "citationCount": None,
-                }
-            )
-            continue
-        authors_ids.append(author_id)
-
-    session = create_session()
-    authors_details = []
-
-    for start_index in range(0, len(authors_ids), 1000):
-        end_index = min(start_index + 1000, len(authors_ids))
-        batch_ids = authors_ids[start_index:end_index]
+    name_only = [NAME_ONLY_RE.fullmatch(author_id) for author_id in all_authors_ids]
+    author_details_wo_id = [
+        {
+            "authorId": author_id,
+            "hIndex": None,
+            "name": author_id,
+            "citationCount": None,
+        }
+        for author_id, is_name in zip(all_authors_ids, name_only)
+        if is_name
+    ]
+    authors_ids = [
+        author_id
+        for author_id, is_name in zip(all_authors_ids, name_only)
+        if not is_name
+    ]
 
-        endpoint = "https://api.semanticscholar.org/graph/v1/author/batch"
-        params = {"fields": "name,hIndex,citationCount"}
-        json_data = {"ids": batch_ids}
+    session = get_session()
+    endpoint = "https://api.semanticscholar.org/graph/v1/author/batch"
+    params = {"fields": "name,hIndex,citationCount"}
 
+    def fetch(start_index):
+        end_index = min(start_index + AUTHOR_BATCH_LIMIT, len(authors_ids))
         print(f"Fetching details for authors {start_index+1} to {end_index}")
         response_data = handle_api_request(
-            session, endpoint, params=params, json=json_data, method="POST"
+            session,
+            endpoint,
+            params=params,
+            json={"ids": authors_ids[start_index:end_index]},
+            method="POST",
         )
+        return response_data or []
 
-        if response_data:
-            authors_details.extend(response_data)
+    # All batches go out together instead of one after another
+    responses = fetch_concurrently(
+        fetch, range(0, len(authors_ids), AUTHOR_BATCH_LIMIT)
+    )
+    authors_details = list(itertools.chain.from_iterable(responses))
 
     return authors_details + author_details_wo_id
 
 
 def update_journal(journal, publication_venue, external_ids):
     """Update the journal of the recommended articles"""
-    journal_name = []
+    # Case-folded name -> name as first seen, in insertion order
+    journal_names = {}
     if journal is not None and "name" in journal:
-        journal_name.append(journal["name"])
+        journal_names[journal["name"].casefold()] = journal["name"]
 
     if publication_venue is not None and "name" in publication_venue:
-        for name in journal_name.copy():
-            if publication_venue["name"].lower() == name.lower():
-                continue
-            journal_name.append(publication_venue["name"])
+        journal_names.setdefault(
+            publication_venue["name"].casefold(), publication_venue["name"]
+        )
 
-    if not journal_name:
+    if not journal_names:
         for external_id in external_ids:
-            if external_id in ["CorpusId", "DOI"]:
+            if external_id in ("CorpusId", "DOI"):
                 continue
-            journal_name.append(external_id)
+            journal_names[external_id] = external_id
 
-    if not journal_name:
-        journal_name = None
-    else:
-        journal_name = list(set(journal_name))
-        journal_name = ", ".join(journal_name)
-    return journal_name
+    if not journal_names:
+        return None
+    return ", ".join(journal_names.values())
 
 
 def add_recommendations(topic_obj, limit=500, fields=FIELDS):
@@ -390,7 +606,7 @@ def add_recommendations(topic_obj, limit=500, fields=FIELDS):
         "negativePaperIds": list(topic_obj.paper_ids["negative"].keys()),
     }
 
-    session = create_session()
+    session = get_session()
     print(f"Fetching recommendations for topic {topic_obj.topic}")
     response_data = handle_api_request(
         session, endpoint, params=params, json=json_data, method="POST"
@@ -402,37 +618,34 @@ def add_recommendations(topic_obj, limit=500, fields=FIELDS):
     return response_data
 
 
-def metrics_over_time_js(data) -> plt:
-    """Return the metrics over time"""
-    dic = {}
-    for _, paper_obj in data.items():
-        publication_date = paper_obj.info.publication_date
-        if publication_date is None or publication_date == "":
-            continue
-        citation_count = paper_obj.info.citation_count
-        if citation_count is None or citation_count == "":
-            continue
-
-        year = publication_date.split("-")[0]
-        if year not in dic:
-            dic[year] = {"num_articles": 0, "num_citations": 0}
-        dic[year]["num_articles"] += 1
-        dic[year]["num_citations"] += citation_count
+def metrics_over_time_js(data) -> pd.DataFrame:
+    """Return the number of articles and citations per publication year"""
+    df = pd.DataFrame(
+        [
+            # Dates are ISO strings, so the year is the first four characters
+            (paper_obj.info.publication_date[:4], paper_obj.info.citation_count)
+            for paper_obj in data.values()
+            if paper_obj.info.publication_date not in (None, "")
+            and paper_obj.info.citation_count not in (None, "")
+        ],
+        columns=["Year", "citations"],
+    )
 
-    df = pd.DataFrame(dic).T
-    df["Year"] = df.index
-    df = df.sort_values(by="Year", ascending=True)
-    return df
+    # groupby sorts the years itself; Year stays a column, not the index
+    return df.groupby("Year", sort=True, as_index=False).agg(
+        num_articles=("citations", "size"), num_citations=("citations", "sum")
+    )
 
 
 def read_yaml(file_path):
     """Read YAML file"""
-    with open(file_path, "r", encoding="utf-8") as file:
-        data = yaml.safe_load(file)
+    # Binary mode lets libyaml decode the bytes itself
+    with open(file_path, "rb") as file:
+        data = yaml.load(file, Loader=YamlLoader)
     return data
 
 
 def write_yaml(data, file_path):
     """Write YAML file"""
     with open(file_path, "w", encoding="utf-8") as file:
-        yaml.dump(data, file, default_flow_style=False)
+        yaml.dump(data, file, Dumper=YamlDumper, default_flow_style=False)
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The modules under code/ import each other as top-level modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+code_dir = os.path.join(project_root, "code")
+if code_dir not in sys.path:
+    sys.path.append(code_dir)
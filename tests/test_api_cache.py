@@ -0,0 +1,46 @@
+"""Tests for the on-disk API response cache"""
+
+import sqlite3
+
+from api_cache import ApiCache
+
+
+def test_set_then_get(tmp_path):
+    cache = ApiCache(str(tmp_path / "responses.sqlite3"))
+    key = cache.key("POST", "https://example.org/batch", {"f": "x"}, {"ids": ["a"]})
+    assert cache.get(key) is None
+    cache.set(key, b"[1]")
+    assert cache.get(key) == b"[1]"
+
+
+def test_key_depends_on_id_order():
+    key = ApiCache.key
+    assert key("POST", "e", None, {"ids": ["a", "b"]}) != key(
+        "POST", "e", None, {"ids": ["b", "a"]}
+    )
+    assert key("GET", "e", {"a": 1, "b": 2}) == key("GET", "e", {"b": 2, "a": 1})
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ApiCache(str(tmp_path / "responses.sqlite3"), ttl=0)
+    cache.set("k", b"[]")
+    assert cache.get("k") is None
+
+
+def test_disabled_cache_does_not_touch_disk(tmp_path):
+    path = tmp_path / "sub" / "responses.sqlite3"
+    cache = ApiCache(str(path), enabled=False)
+    cache.set("k", b"[]")
+    assert cache.get("k") is None
+    assert not path.parent.exists()
+
+
+def test_sqlite_errors_behave_as_misses(tmp_path, monkeypatch):
+    cache = ApiCache(str(tmp_path / "responses.sqlite3"))
+
+    def locked():
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cache, "_connection", locked)
+    cache.set("k", b"[]")
+    assert cache.get("k") is None
@@ -1,5 +1,6 @@
 import os
 import sys
+from collections import defaultdict
 from pathlib import Path
 
 import pandas as pd
@@ -15,27 +16,28 @@ if code_dir not in sys.path:
 from database import DatabaseManager
 
 
-class StreamlitDashboard:
-    def __init__(self):
-        self.db = DatabaseManager()
-        st.set_page_config(
-            page_title="Literature Survey Dashboard", page_icon="📚", layout="wide"
-        )
+@st.cache_resource
+def _get_db():
+    """One DatabaseManager per server process rather than one per rerun"""
+    return DatabaseManager()
 
-    def get_topics(self):
-        """Get all topics from database"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor(dictionary=True)
+
+CACHE_TTL = 300  # Seconds query results are reused across reruns
+
+
+# Streamlit reruns the script on every widget interaction, so the queries
+# are cached free functions; the leading underscore keeps _db out of the key
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _get_topics(_db):
+    with _db.dict_cursor() as cursor:
         cursor.execute("SELECT name FROM topics ORDER BY name")
         topics = [row["name"] for row in cursor.fetchall()]
-        cursor.close()
-        conn.close()
-        return topics
+    return topics
 
-    def get_papers_by_topic(self, topic):
-        """Get papers for a specific topic"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor(dictionary=True)
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _get_papers_by_topic(_db, topic):
+    with _db.dict_cursor() as cursor:
         cursor.execute(
             """
             SELECT p.*, tp.paper_type, tp.use_for_recommendation,
@@ -51,36 +53,62 @@ class StreamlitDashboard:
             (topic,),
         )
         papers = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return papers
-
-    def get_recommendations_for_paper(self, paper_id):
-        """Get recommendations for a specific paper"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor(dictionary=True)
+    return papers
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _get_recommendations_for_papers(_db, paper_ids):
+    # paper_ids is a tuple: cache keys must be hashable
+    rec_map = defaultdict(list)
+    if not paper_ids:
+        return rec_map
+    placeholders = ", ".join(["%s"] * len(paper_ids))
+    with _db.dict_cursor() as cursor:
         cursor.execute(
-            """
-            SELECT p.*, GROUP_CONCAT(a.name) as authors
+            f"""
+            SELECT pr.source_paper_id, p.*, GROUP_CONCAT(a.name) as authors
             FROM papers p
             JOIN paper_recommendations pr ON pr.recommended_paper_id = p.id
             LEFT JOIN paper_authors pa ON p.id = pa.paper_id
             LEFT JOIN authors a ON pa.author_id = a.id
-            WHERE pr.source_paper_id = %s
-            GROUP BY p.id
+            WHERE pr.source_paper_id IN ({placeholders})
+            GROUP BY pr.source_paper_id, p.id
         """,
-            (paper_id,),
+            paper_ids,
+        )
+        for row in cursor.fetchall():
+            rec_map[row.pop("source_paper_id")].append(row)
+    return rec_map
+
+
+class StreamlitDashboard:
+    def __init__(self):
+        self.db = _get_db()
+        st.set_page_config(
+            page_title="Literature Survey Dashboard", page_icon="📚", layout="wide"
         )
-        recommendations = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return recommendations
+
+    def get_topics(self):
+        """Get all topics from database"""
+        return _get_topics(self.db)
+
+    def get_papers_by_topic(self, topic):
+        """Get papers for a specific topic"""
+        return _get_papers_by_topic(self.db, topic)
+
+    def get_recommendations_for_papers(self, paper_ids):
+        """Get recommendations for several papers in one query, keyed by the
+        source paper id"""
+        return _get_recommendations_for_papers(self.db, tuple(paper_ids))
 
     def run(self):
         st.title("Literature Survey Dashboard")
 
         # Sidebar
         st.sidebar.title("Navigation")
+        if st.sidebar.button("Refresh"):
+            # Drop cached query results so new data shows up immediately
+            st.cache_data.clear()
         topics = self.get_topics()
         selected_topic = st.sidebar.selectbox("Select Topic", topics)
 
@@ -113,18 +141,17 @@ class StreamlitDashboard:
 
             # Display papers
             st.subheader("Papers")
-            for _, paper in filtered_df.iterrows():
-                with st.expander(
-                    f"{paper['title']} ({paper['citation_count']} citations)"
-                ):
-                    st.write(f"**Authors:** {paper['authors']}")
-                    st.write(f"**Publication Date:** {paper['publication_date']}")
-                    st.write(f"**Journal:** {paper['journal']}")
-                    st.write(f"**Abstract:** {paper['abstract']}")
-                    st.write(f"**URL:** [{paper['url']}]({paper['url']})")
+            rec_map = self.get_recommendations_for_papers(filtered_df["id"].tolist())
+            for paper in filtered_df.itertuples(index=False):
+                with st.expander(f"{paper.title} ({paper.citation_count} citations)"):
+                    st.write(f"**Authors:** {paper.authors}")
+                    st.write(f"**Publication Date:** {paper.publication_date}")
+                    st.write(f"**Journal:** {paper.journal}")
+                    st.write(f"**Abstract:** {paper.abstract}")
+                    st.write(f"**URL:** [{paper.url}]({paper.url})")
 
                     # Show recommendations if available
-                    recommendations = self.get_recommendations_for_paper(paper["id"])
+                    recommendations = rec_map[paper.id]
                     if recommendations:
                         st.write("**Recommendations:**")
                         rec_df = pd.DataFrame(recommendations)
@@ -0,0 +1,8 @@
+"""Tests for the SQL helpers in database.py (no server needed)"""
+
+from database import _values_source
+
+
+def test_values_source():
+    assert _values_source(2, 1) == "VALUES (%s, %s) AS new"
+    assert _values_source(1, 3) == "VALUES (%s), (%s), (%s) AS new"
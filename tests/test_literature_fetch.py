@@ -0,0 +1,19 @@
+"""Tests for the CSV helpers of the ingest script"""
+
+import pytest
+from literature_fetch_recommendation_api import PAPER_ID_RE
+
+
+@pytest.mark.parametrize(
+    "link, paper_id",
+    [
+        ("https://www.semanticscholar.org/paper/Some-Title/abc123", "abc123"),
+        ("https://www.semanticscholar.org/paper/abc123?utm_source=x", "abc123"),
+        ("https://www.semanticscholar.org/paper/abc123?next=/a/b", "abc123"),
+        ("abc123", "abc123"),
+        # Blank ids are skipped by process_csv_chunk
+        ("https://www.semanticscholar.org/paper/", ""),
+    ],
+)
+def test_paper_id_re(link, paper_id):
+    assert PAPER_ID_RE.search(link).group(1) == paper_id
@@ -0,0 +1,126 @@
+"""Tests for the API pacing and paper-cache logic in utils.py (no network)"""
+
+import time
+
+import pytest
+import utils
+from api_cache import ApiCache
+from utils import TokenBucket, get_paper_details
+
+
+def test_observe_ignores_plenty_of_quota():
+    bucket = TokenBucket(rate=10, burst=10)
+    bucket.observe({"X-RateLimit-Remaining": "50", "X-RateLimit-Reset": "30"})
+    assert bucket.paused_until == 0.0
+
+
+def test_observe_ignores_missing_or_bad_headers():
+    bucket = TokenBucket(rate=10, burst=10)
+    bucket.observe({})
+    bucket.observe({"X-RateLimit-Remaining": "soon"})
+    assert bucket.paused_until == 0.0
+
+
+def test_observe_spreads_quota_over_relative_reset():
+    bucket = TokenBucket(rate=10, burst=10)
+    before = time.monotonic()
+    bucket.observe({"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": "10"})
+    assert bucket.paused_until == pytest.approx(before + 5, abs=0.5)
+
+
+def test_observe_spreads_quota_over_epoch_reset():
+    bucket = TokenBucket(rate=10, burst=10)
+    before = time.monotonic()
+    reset = str(time.time() + 20)
+    bucket.observe({"X-RateLimit-Remaining": "4", "X-RateLimit-Reset": reset})
+    assert bucket.paused_until == pytest.approx(before + 5, abs=0.5)
+
+
+def test_observe_with_no_quota_left_waits_for_reset():
+    bucket = TokenBucket(rate=10, burst=10)
+    before = time.monotonic()
+    bucket.observe({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "3"})
+    assert bucket.paused_until == pytest.approx(before + 3, abs=0.5)
+
+
+def test_slow_down_and_speed_up_stay_in_bounds():
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.slow_down()
+    assert bucket.rate == pytest.approx(0.8)
+    for _ in range(100):
+        bucket.slow_down()
+    assert bucket.rate == pytest.approx(0.1)
+    for _ in range(1000):
+        bucket.speed_up()
+    assert bucket.rate == 1
+
+
+@pytest.fixture
+def fake_api(monkeypatch, tmp_path):
+    """Answer paper/batch requests locally, recording the ids requested"""
+    requested = []
+
+    def handle_api_request(session, endpoint, params=None, json=None, method="GET"):
+        requested.append(list(json["ids"]))
+        return [
+            None if paper_id.startswith("unknown") else {"paperId": paper_id}
+            for paper_id in json["ids"]
+        ]
+
+    monkeypatch.setattr(utils, "handle_api_request", handle_api_request)
+    monkeypatch.setattr(utils, "_paper_cache", {})
+    cache = ApiCache(str(tmp_path / "responses.sqlite3"))
+    monkeypatch.setattr(utils, "get_api_cache", lambda: cache)
+    return requested
+
+
+def test_get_paper_details_keeps_request_order(fake_api):
+    result = get_paper_details(["b", "unknown1", "a", "b"])
+    assert result == [{"paperId": "b"}, None, {"paperId": "a"}, {"paperId": "b"}]
+    assert fake_api == [["b", "unknown1", "a"]]
+
+
+def test_get_paper_details_merges_cached_and_fetched(fake_api):
+    get_paper_details(["a", "b"])
+    result = get_paper_details(["c", "a", "b"])
+    assert [paper["paperId"] for paper in result] == ["c", "a", "b"]
+    assert fake_api == [["a", "b"], ["c"]]
+
+
+def test_get_paper_details_does_not_cache_misses(fake_api):
+    get_paper_details(["unknown1"])
+    get_paper_details(["unknown1"])
+    assert fake_api == [["unknown1"], ["unknown1"]]
+
+
+def test_get_paper_details_skips_cache_when_disabled(fake_api):
+    utils.get_api_cache().enabled = False
+    get_paper_details(["a"])
+    get_paper_details(["a"])
+    assert fake_api == [["a"], ["a"]]
+
+
+def test_get_paper_details_other_fields_bypass_cache(fake_api):
+    get_paper_details(["a"])
+    get_paper_details(["a"], fields="paperId,title")
+    assert fake_api == [["a"], ["a"]]
+
+
+def test_author_responses_bypass_disk_cache(monkeypatch, tmp_path):
+    cache = ApiCache(str(tmp_path / "responses.sqlite3"))
+    monkeypatch.setattr(utils, "get_api_cache", lambda: cache)
+    sent = []
+
+    class Response:
+        content = b"[]"
+
+    def send_api_request(session, endpoint, params=None, json=None, method="GET"):
+        sent.append(endpoint)
+        return Response()
+
+    monkeypatch.setattr(utils, "_send_api_request", send_api_request)
+    author = "https://api.semanticscholar.org/graph/v1/author/batch"
+    paper = "https://api.semanticscholar.org/graph/v1/paper/batch"
+    for endpoint in (author, paper, author, paper):
+        assert utils.handle_api_request(None, endpoint, json={"ids": ["a"]}) == []
+    assert sent == [author, paper, author]
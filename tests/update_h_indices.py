@@ -1,102 +1,130 @@
 #!/usr/bin/env python3
 
-import time
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
 from article import Article
 from author import Author
 from database import DatabaseManager
 from utils import get_author_details, update_h_index
 
+PAPER_BATCH_SIZE = 1000  # Papers read from the database per page
+STALE_AFTER_DAYS = 7  # Papers updated more recently than this are skipped
+
 
 class HIndexUpdater:
     def __init__(self):
         self.db = DatabaseManager()
 
-    def get_all_papers(self) -> List[Dict]:
-        """Get all papers with their authors from the database"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        cursor.execute(
-            """
-            SELECT 
-                p.*,
-                GROUP_CONCAT(pa.author_id) as author_ids,
-                GROUP_CONCAT(a.name) as author_names
-            FROM papers p
-            LEFT JOIN paper_authors pa ON p.id = pa.paper_id
-            LEFT JOIN authors a ON pa.author_id = a.id
-            GROUP BY p.id
-        """
-        )
-
-        papers = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return papers
+    def get_all_papers(
+        self, batch_size: int = PAPER_BATCH_SIZE
+    ) -> Iterator[List[Dict]]:
+        """Yield the papers whose h-index is missing or stale, with their
+        authors, batch_size rows at a time"""
+        last_id = ""
+        while True:
+            # Keyset paging: each page is its own short query, so no result
+            # set stays open while the API is being called
+            papers = self._get_paper_page(last_id, batch_size)
+            if not papers:
+                return
+            yield papers
+            last_id = papers[-1]["id"]
+
+    def _get_paper_page(self, after_id: str, limit: int) -> List[Dict]:
+        """Stale papers with ids after after_id, in id order"""
+        with self.db.dict_cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT 
+                    p.*,
+                    GROUP_CONCAT(pa.author_id) as author_ids,
+                    GROUP_CONCAT(a.name) as author_names
+                FROM papers p
+                LEFT JOIN paper_authors pa ON p.id = pa.paper_id
+                LEFT JOIN authors a ON pa.author_id = a.id
+                WHERE (p.h_index IS NULL
+                       OR p.updated_at < NOW() - INTERVAL %s DAY)
+                    AND p.id > %s
+                GROUP BY p.id
+                ORDER BY p.id
+                LIMIT %s
+            """,
+                (STALE_AFTER_DAYS, after_id, limit),
+            )
+            return cursor.fetchall()
 
     def update_paper_h_indices(self):
-        """Update h-index for all papers in the database"""
-        papers = self.get_all_papers()
-        total_papers = len(papers)
-        print(f"Found {total_papers} papers to update")
-
-        batch_size = 5  # Process papers in small batches to manage API calls
-        for i in range(0, total_papers, batch_size):
-            batch = papers[i : i + batch_size]
-            print(
-                f"\nProcessing batch {i//batch_size + 1}/{(total_papers + batch_size - 1)//batch_size}"
+        """Update h-index for papers whose h-index is missing or stale"""
+        author_map: Dict[str, Dict] = {}
+        total_papers = 0
+        for papers in self.get_all_papers():
+            total_papers += len(papers)
+            print(f"Updating {len(papers)} papers ({total_papers} so far)")
+
+            # Fetch every author once, however many papers they appear on
+            new_author_ids = list(
+                dict.fromkeys(
+                    author_id
+                    for paper_data in papers
+                    if paper_data["author_ids"]
+                    for author_id in paper_data["author_ids"].split(",")
+                    if author_id not in author_map
+                )
+            )
+            print(f"Fetching details for {len(new_author_ids)} authors...")
+            author_map.update(
+                (author_detail["authorId"], author_detail)
+                for author_detail in get_author_details(new_author_ids)
+                if author_detail
             )
 
-            for paper_data in batch:
-                try:
-                    print(f"\nProcessing paper: {paper_data['title'][:50]}...")
-
-                    # Create Article object
-                    article = Article(paper_data["id"])
-                    article.info.title = paper_data["title"]
-                    article.info.abstract = paper_data["abstract"]
-                    article.info.url = paper_data["url"]
-                    article.info.journal = paper_data["journal"]
-                    article.info.publication_date = paper_data["publication_date"]
-                    article.info.citation_count = paper_data["citation_count"]
-
-                    # Process authors
-                    if paper_data["author_ids"]:
-                        author_ids = paper_data["author_ids"].split(",")
-                        author_names = paper_data["author_names"].split(",")
-
-                        # Create Author objects
-                        for author_id, author_name in zip(author_ids, author_names):
-                            author = Author(
-                                author_id=author_id, author_name=author_name
-                            )
-                            article.authors.append(author)
-
-                        # Get author details and update h-index
-                        print(f"Fetching details for {len(author_ids)} authors...")
-                        author_details = get_author_details(author_ids)
-
-                        # Update h-index
-                        old_h_index = paper_data["h_index"]
-                        new_h_index = update_h_index(article, author_details)
-
-                        print(f"H-index updated: {old_h_index} -> {new_h_index}")
-
-                        # Store updated paper
-                        self.db.insert_paper(article)
-                    else:
-                        print("No authors found for this paper")
-
-                except Exception as e:
-                    print(f"Error processing paper {paper_data['id']}: {e}")
-                    continue
-
-            # Add a small delay between batches to respect API rate limits
-            if i + batch_size < total_papers:
-                print("Waiting before next batch...")
-                time.sleep(2)
+            for paper_data in papers:
+                self.update_paper_h_index(paper_data, author_map)
+
+        print(f"Processed {total_papers} papers")
+
+    def update_paper_h_index(self, paper_data: Dict, author_map: Dict[str, Dict]):
+        """Recompute and store the h-index of a single paper"""
+        try:
+            print(f"\nProcessing paper: {paper_data['title'][:50]}...")
+
+            # Create Article object
+            article = Article(paper_data["id"])
+            article.info.title = paper_data["title"]
+            article.info.abstract = paper_data["abstract"]
+            article.info.url = paper_data["url"]
+            article.info.journal = paper_data["journal"]
+            article.info.publication_date = paper_data["publication_date"]
+            article.info.citation_count = paper_data["citation_count"]
+
+            # Process authors
+            if paper_data["author_ids"]:
+                author_ids = paper_data["author_ids"].split(",")
+                author_names = paper_data["author_names"].split(",")
+
+                # Create Author objects
+                for author_id, author_name in zip(author_ids, author_names):
+                    author = Author(author_id=author_id, author_name=author_name)
+                    article.authors.append(author)
+
+                # Author details were fetched up front for all papers
+                author_details = [author_map.get(a) for a in author_ids]
+
+                # Update h-index
+                old_h_index = paper_data["h_index"]
+                new_h_index = update_h_index(article, author_details)
+
+                print(f"H-index updated: {old_h_index} -> {new_h_index}")
+            else:
+                # Stored as 0, as update_h_index does, so the paper is not
+                # picked up again on every run
+                print("No authors found for this paper")
+                new_h_index = 0
+
+            self.db.update_paper_h_index(paper_data["id"], new_h_index)
+
+        except Exception as e:
+            print(f"Error processing paper {paper_data['id']}: {e}")
 
 
 def main():